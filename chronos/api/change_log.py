@@ -0,0 +1,215 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint
+
+# Redis list buffering change log entries until the next flush
+CHANGE_LOG_BUFFER_KEY = "chronos_change_log_buffer"
+FLUSH_BATCH_SIZE = 5000
+# Held while flushing, so overlapping runs never trim entries the other has not inserted
+FLUSH_LOCK_KEY = "chronos_change_log_flush_lock"
+FLUSH_LOCK_TIMEOUT = 600
+
+CHANGE_LOG_FIELDS = [
+	"configuration",
+	"block_doctype",
+	"block_name",
+	"action",
+	"user",
+	"timestamp",
+	"old_row",
+	"new_row",
+	"old_start",
+	"new_start",
+	"old_end",
+	"new_end",
+	"old_duration",
+	"new_duration"
+]
+
+
+def get_tracked_values(config, block_doc):
+	"""Get the row, start, end and duration of a block, as recorded in the change log"""
+	return {
+		"row": block_doc.get(config.row_to_block_field),
+		"start": block_doc.get(config.block_to_date_field),
+		"end": block_doc.get(config.date_range_end_field) if config.date_range_end_field else None,
+		"duration": block_doc.get(config.block_duration_field) if config.block_duration_field else None
+	}
+
+
+def record_block_change(config, block_doc, action, old_values=None):
+	"""Queue a change log entry for a block; it is buffered once the transaction commits"""
+	old_values = old_values or {}
+	new_values = get_tracked_values(config, block_doc)
+
+	entry = {
+		"configuration": config.name,
+		"block_doctype": block_doc.doctype,
+		"block_name": block_doc.name,
+		"action": action,
+		"user": frappe.session.user,
+		"timestamp": frappe.utils.now()
+	}
+	for key in ("row", "start", "end", "duration"):
+		entry[f"old_{key}"] = old_values.get(key)
+		entry[f"new_{key}"] = new_values.get(key)
+
+	pending = frappe.local.flags.setdefault("chronos_change_log", [])
+	if not pending:
+		frappe.db.after_commit.add(buffer_pending_changes)
+		frappe.db.after_rollback.add(discard_pending_changes)
+	pending.append(json.dumps(entry, default=str))
+
+
+def buffer_pending_changes():
+	"""Push the entries recorded in this transaction to the Redis buffer and the user's undo journal"""
+	# Imported here, the journal records its own changes through this module
+	from chronos.api.timeline_journal import record_journal_entry
+
+	pending = frappe.local.flags.pop("chronos_change_log", None)
+	if pending:
+		cache = frappe.cache()
+		pipeline = cache.pipeline()
+		pipeline.rpush(cache.make_key(CHANGE_LOG_BUFFER_KEY), *pending)
+		pipeline.execute()
+
+		record_journal_entry([json.loads(entry) for entry in pending])
+
+
+def discard_pending_changes():
+	"""Drop the entries recorded in a transaction that was rolled back"""
+	frappe.local.flags.pop("chronos_change_log", None)
+
+
+def flush_change_log():
+	"""Scheduler job: move buffered entries into Timeline Change Log with bulk inserts
+
+	Entries are only trimmed from the buffer once their batch is committed. Names
+	are derived from the entry, so a batch inserted again after a flush died
+	between commit and trim is skipped instead of duplicated.
+	"""
+	cache = frappe.cache()
+	lock_key = cache.make_key(FLUSH_LOCK_KEY)
+	if not cache.set(lock_key, frappe.local.site, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+		return
+
+	try:
+		while True:
+			raw_entries = peek_buffered_entries(FLUSH_BATCH_SIZE)
+			if not raw_entries:
+				break
+
+			now = frappe.utils.now()
+			values = []
+			for raw_entry in raw_entries:
+				entry = json.loads(raw_entry)
+				values.append(
+					[get_entry_name(raw_entry), now, now, entry["user"], entry["user"]]
+					+ [entry.get(field) for field in CHANGE_LOG_FIELDS]
+				)
+
+			frappe.db.bulk_insert(
+				"Timeline Change Log",
+				["name", "creation", "modified", "owner", "modified_by"] + CHANGE_LOG_FIELDS,
+				values,
+				ignore_duplicates=True
+			)
+			frappe.db.commit()
+
+			# New entries are only ever appended, the head is what was just inserted
+			cache.ltrim(CHANGE_LOG_BUFFER_KEY, len(raw_entries), -1)
+
+			if len(raw_entries) < FLUSH_BATCH_SIZE:
+				break
+	finally:
+		cache.delete(lock_key)
+
+
+def peek_buffered_entries(count):
+	"""Get up to `count` raw entries from the head of the Redis buffer, leaving them there"""
+	cache = frappe.cache()
+	return cache.lrange(CHANGE_LOG_BUFFER_KEY, 0, count - 1) or []
+
+
+def get_entry_name(raw_entry):
+	"""Name a change log entry after its content, so inserting it twice is a no-op"""
+	if isinstance(raw_entry, str):
+		raw_entry = raw_entry.encode()
+	return hashlib.sha1(raw_entry).hexdigest()[:20]
+
+
+def get_buffered_entries():
+	"""Get entries not flushed to the database yet, oldest first"""
+	entries = frappe.cache().lrange(CHANGE_LOG_BUFFER_KEY, 0, -1) or []
+	return [json.loads(entry) for entry in entries]
+
+
+@frappe.whitelist()
+def get_block_history(block_doctype, block_name, limit=50):
+	"""Get the change history of a block, newest first, including entries not flushed yet"""
+	try:
+		limit = cint(limit) or 50
+
+		pending = [
+			entry for entry in get_buffered_entries()
+			if entry["block_doctype"] == block_doctype and entry["block_name"] == block_name
+		]
+		history = frappe.get_all(
+			"Timeline Change Log",
+			filters={"block_doctype": block_doctype, "block_name": block_name},
+			fields=CHANGE_LOG_FIELDS,
+			order_by="timestamp desc",
+			limit_page_length=limit
+		)
+
+		return {
+			"success": True,
+			"history": (list(reversed(pending)) + history)[:limit]
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Get Block History Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+@frappe.whitelist()
+def get_configuration_history(configuration_name, since=None, limit=200):
+	"""Get the recent change history of every block of a configuration, newest first"""
+	try:
+		limit = cint(limit) or 200
+
+		filters = {"configuration": configuration_name}
+		if since:
+			filters["timestamp"] = [">=", since]
+
+		pending = [
+			entry for entry in get_buffered_entries()
+			if entry["configuration"] == configuration_name and (not since or entry["timestamp"] >= since)
+		]
+		history = frappe.get_all(
+			"Timeline Change Log",
+			filters=filters,
+			fields=CHANGE_LOG_FIELDS,
+			order_by="timestamp desc",
+			limit_page_length=limit
+		)
+
+		return {
+			"success": True,
+			"history": (list(reversed(pending)) + history)[:limit]
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Get Configuration History Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
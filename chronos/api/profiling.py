@@ -0,0 +1,189 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import cint
+
+# Redis list of recent samples per endpoint and configuration, and the set of those lists
+PROFILE_KEY = "chronos_profile:{0}:{1}"
+PROFILE_INDEX_KEY = "chronos_profile_keys"
+MAX_SAMPLES = 1000
+
+PROFILE_HEADER = "X-Chronos-Profile"
+
+
+def is_profiling_enabled():
+	"""Profiling is on for the whole site with `chronos_profiling` in site config,
+	or per request for System Managers sending the `X-Chronos-Profile` header"""
+	if cint(frappe.conf.get("chronos_profiling")):
+		return True
+
+	request = getattr(frappe.local, "request", None)
+	return bool(
+		request
+		and request.headers.get(PROFILE_HEADER)
+		and "System Manager" in frappe.get_roles()
+	)
+
+
+def profile_endpoint(fn):
+	"""Record phase timings, SQL count/time and payload size of a whitelisted endpoint when profiling is on"""
+	endpoint = f"{fn.__module__}.{fn.__name__}"
+	fnargs = list(inspect.signature(fn).parameters)
+
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		if getattr(frappe.local, "chronos_profile", None) is not None or not is_profiling_enabled():
+			return fn(*args, **kwargs)
+
+		profile = frappe.local.chronos_profile = {"endpoint": endpoint, "phases": {}}
+		try:
+			with track_queries() as queries:
+				started = time.perf_counter()
+				result = fn(*args, **kwargs)
+				profile["total_ms"] = elapsed_ms(started)
+
+			started = time.perf_counter()
+			profile["payload_bytes"] = len(frappe.as_json(result, indent=None))
+			profile["phases"]["serialise"] = elapsed_ms(started)
+			profile["queries"] = queries["count"]
+			profile["query_ms"] = round(queries["time"] * 1000, 2)
+
+			bound = dict(zip(fnargs, args), **kwargs)
+			profile["configuration"] = bound.get("configuration_name") or bound.get("config_name")
+			store_profile(profile)
+		finally:
+			frappe.local.chronos_profile = None
+			frappe.local.chronos_last_profile = profile
+
+		return result
+
+	# Frappe maps request arguments on `fnargs` instead of the wrapper's *args/**kwargs
+	wrapper.fnargs = fnargs
+	return wrapper
+
+
+@contextmanager
+def profile_phase(name):
+	"""Time a phase of the endpoint being profiled; a no-op when profiling is off"""
+	profile = getattr(frappe.local, "chronos_profile", None)
+	if profile is None:
+		yield
+		return
+
+	started = time.perf_counter()
+	try:
+		yield
+	finally:
+		phases = profile["phases"]
+		phases[name] = round(phases.get(name, 0) + elapsed_ms(started), 2)
+
+
+@contextmanager
+def track_queries():
+	"""Count the `frappe.db.sql` calls made inside the block and the time spent in them"""
+	stats = {"count": 0, "time": 0.0}
+	sql = frappe.db.sql
+	# Restore an outer tracker instead of dropping it when blocks are nested
+	outer = frappe.db.__dict__.get("sql")
+
+	def tracked_sql(*args, **kwargs):
+		started = time.perf_counter()
+		try:
+			return sql(*args, **kwargs)
+		finally:
+			stats["count"] += 1
+			stats["time"] += time.perf_counter() - started
+
+	frappe.db.sql = tracked_sql
+	try:
+		yield stats
+	finally:
+		if outer:
+			frappe.db.sql = outer
+		else:
+			del frappe.db.sql
+
+
+def elapsed_ms(started):
+	return round((time.perf_counter() - started) * 1000, 2)
+
+
+def store_profile(profile):
+	"""Keep the last `MAX_SAMPLES` profiles per endpoint and configuration in Redis"""
+	cache = frappe.cache()
+	name = PROFILE_KEY.format(profile["endpoint"], profile["configuration"] or "")
+	key = cache.make_key(name)
+
+	pipeline = cache.pipeline()
+	pipeline.lpush(key, json.dumps(profile))
+	pipeline.ltrim(key, 0, MAX_SAMPLES - 1)
+	pipeline.sadd(cache.make_key(PROFILE_INDEX_KEY), name)
+	pipeline.execute()
+
+
+def add_profile_header(response=None, request=None):
+	"""after_request hook: attach the profile of this request as a compact JSON header"""
+	profile = getattr(frappe.local, "chronos_last_profile", None)
+	if profile and response is not None:
+		response.headers[PROFILE_HEADER] = json.dumps(profile, separators=(",", ":"))
+
+
+@frappe.whitelist()
+def get_profile_stats(endpoint=None, configuration=None):
+	"""Get p50/p95 latency, queries and payload size per profiled endpoint and configuration"""
+	frappe.only_for("System Manager")
+
+	try:
+		cache = frappe.cache()
+		stats = []
+		for name in sorted(frappe.safe_decode(name) for name in cache.smembers(PROFILE_INDEX_KEY)):
+			samples = [json.loads(sample) for sample in cache.lrange(name, 0, -1)]
+			if not samples:
+				continue
+
+			sample = samples[0]
+			if endpoint and sample["endpoint"] != endpoint:
+				continue
+			if configuration and sample["configuration"] != configuration:
+				continue
+
+			stats.append({
+				"endpoint": sample["endpoint"],
+				"configuration": sample["configuration"],
+				"samples": len(samples),
+				"total_ms": summarise(samples, lambda s: s["total_ms"]),
+				"query_ms": summarise(samples, lambda s: s["query_ms"]),
+				"queries": summarise(samples, lambda s: s["queries"]),
+				"payload_bytes": summarise(samples, lambda s: s["payload_bytes"]),
+				"phases": {
+					phase: summarise(samples, lambda s, phase=phase: s["phases"].get(phase, 0))
+					for phase in sample["phases"]
+				}
+			})
+
+		return {
+			"success": True,
+			"stats": stats
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Get Profile Stats Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def summarise(samples, value):
+	values = sorted(value(sample) for sample in samples)
+	return {
+		"p50": values[round(0.5 * (len(values) - 1))],
+		"p95": values[round(0.95 * (len(values) - 1))]
+	}
@@ -0,0 +1,59 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import json
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from chronos.api.change_log import CHANGE_LOG_BUFFER_KEY, flush_change_log, get_buffered_entries
+
+BLOCK_DOCTYPE = "ToDo"
+
+
+def buffer_entries(count):
+	"""Push `count` change log entries for made-up blocks to the Redis buffer; returns their block names"""
+	names = [f"chronos-test-{frappe.generate_hash(length=8)}" for _ in range(count)]
+	for name in names:
+		frappe.cache().rpush(CHANGE_LOG_BUFFER_KEY, json.dumps({
+			"configuration": None,
+			"block_doctype": BLOCK_DOCTYPE,
+			"block_name": name,
+			"action": "move",
+			"user": "Administrator",
+			"timestamp": frappe.utils.now()
+		}))
+	return names
+
+
+class TestFlushChangeLog(FrappeTestCase):
+	def setUp(self):
+		frappe.cache().delete_value(CHANGE_LOG_BUFFER_KEY)
+		self.names = []
+
+	def tearDown(self):
+		frappe.db.delete("Timeline Change Log", {"block_name": ["in", self.names or [""]]})
+		frappe.db.commit()
+
+	def test_flush_empties_the_buffer(self):
+		self.names = buffer_entries(3)
+		flush_change_log()
+
+		self.assertEqual(get_buffered_entries(), [])
+		self.assertEqual(frappe.db.count("Timeline Change Log", {"block_name": ["in", self.names]}), 3)
+
+	def test_flush_drains_more_than_one_batch(self):
+		self.names = buffer_entries(5)
+		with patch("chronos.api.change_log.FLUSH_BATCH_SIZE", 2):
+			flush_change_log()
+
+		self.assertEqual(get_buffered_entries(), [])
+		self.assertEqual(frappe.db.count("Timeline Change Log", {"block_name": ["in", self.names]}), 5)
+
+	def test_second_flush_inserts_nothing_again(self):
+		self.names = buffer_entries(2)
+		flush_change_log()
+		flush_change_log()
+
+		self.assertEqual(frappe.db.count("Timeline Change Log", {"block_name": ["in", self.names]}), 2)
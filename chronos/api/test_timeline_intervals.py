@@ -0,0 +1,138 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+import unittest
+
+from chronos.api.timeline_intervals import aggregate_utilisation, find_overlaps, get_ripple_shifts
+from chronos.tests.utils import at, block, make_config, on
+
+
+class TestFindOverlaps(unittest.TestCase):
+	def test_touching_blocks_do_not_clash(self):
+		records = [
+			block("A", "R1", at(1, 8), at(1, 10), 2),
+			block("B", "R1", at(1, 10), at(1, 12), 2)
+		]
+		self.assertEqual(find_overlaps(make_config(), records), [])
+
+	def test_chain_is_one_conflict_with_combined_span(self):
+		records = [
+			block("C", "R1", at(1, 11), at(1, 13), 2),
+			block("A", "R1", at(1, 8), at(1, 10), 2),
+			block("B", "R1", at(1, 9), at(1, 12), 3),
+			block("D", "R2", at(1, 9), at(1, 12), 3)
+		]
+		conflicts = find_overlaps(make_config(), records)
+
+		self.assertEqual(len(conflicts), 1)
+		self.assertEqual(conflicts[0]["row_id"], "R1")
+		self.assertEqual(conflicts[0]["blocks"], ["A", "B", "C"])
+		self.assertEqual(conflicts[0]["start"], "2025-01-01 08:00:00")
+		self.assertEqual(conflicts[0]["end"], "2025-01-01 13:00:00")
+
+	def test_zero_length_blocks_clash_only_at_the_same_start(self):
+		same_start = [
+			block("A", "R1", at(1, 8), at(1, 8)),
+			block("B", "R1", at(1, 8), None)
+		]
+		at_end = [
+			block("A", "R1", at(1, 8), at(1, 10), 2),
+			block("B", "R1", at(1, 10), at(1, 10))
+		]
+
+		self.assertEqual(find_overlaps(make_config(), same_start)[0]["blocks"], ["A", "B"])
+		self.assertEqual(find_overlaps(make_config(), at_end), [])
+
+	def test_date_ends_are_inclusive(self):
+		shared_day = [
+			block("A", "R1", on(1), on(2)),
+			block("B", "R1", on(2), on(3))
+		]
+		next_day = [
+			block("A", "R1", on(1), on(1)),
+			block("B", "R1", on(2), on(2))
+		]
+
+		self.assertEqual(len(find_overlaps(make_config("Date"), shared_day)), 1)
+		self.assertEqual(find_overlaps(make_config("Date"), next_day), [])
+
+	def test_unassigned_blocks_are_ignored(self):
+		records = [
+			block("A", None, at(1, 8), at(1, 10), 2),
+			block("B", None, at(1, 8), at(1, 10), 2)
+		]
+		self.assertEqual(find_overlaps(make_config(), records), [])
+
+
+class TestAggregateUtilisation(unittest.TestCase):
+	def test_load_is_split_over_days_by_overlap(self):
+		records = [block("A", "R1", at(1, 22), at(2, 2), 4)]
+		result = aggregate_utilisation(make_config(), records, ["R1"], "2025-01-01", "2025-01-03")
+
+		self.assertEqual(result["buckets"], ["2025-01-01", "2025-01-02", "2025-01-03"])
+		self.assertEqual(result["matrix"], [[2.0, 2.0, 0.0]])
+
+	def test_date_blocks_cover_their_end_day(self):
+		records = [block("A", "R1", on(1), on(2))]
+		result = aggregate_utilisation(make_config("Date", duration=False), records, ["R1"], "2025-01-01", "2025-01-02")
+
+		self.assertEqual(result["unit"], "hours")
+		self.assertEqual(result["matrix"], [[24.0, 24.0]])
+
+	def test_week_buckets_start_on_monday(self):
+		# 2025-01-01 is a Wednesday
+		records = [block("A", "R1", at(6, 8), at(6, 10), 2)]
+		result = aggregate_utilisation(make_config(), records, ["R1"], "2025-01-01", "2025-01-07", bucket="week")
+
+		self.assertEqual(result["buckets"], ["2024-12-30", "2025-01-06"])
+		self.assertEqual(result["matrix"], [[0.0, 2.0]])
+
+	def test_zero_length_block_loads_its_bucket(self):
+		records = [block("A", "R1", at(2, 8), at(2, 8), 3)]
+		result = aggregate_utilisation(make_config(), records, ["R1"], "2025-01-01", "2025-01-02")
+
+		self.assertEqual(result["matrix"], [[0.0, 3.0]])
+
+	def test_blocks_on_other_rows_are_ignored(self):
+		records = [block("A", "R2", at(1, 8), at(1, 10), 2)]
+		result = aggregate_utilisation(make_config(), records, ["R1"], "2025-01-01", "2025-01-01")
+
+		self.assertEqual(result["matrix"], [[0.0]])
+
+
+class TestGetRippleShifts(unittest.TestCase):
+	def test_push_travels_until_a_gap_absorbs_it(self):
+		records = [
+			block("A", "R1", at(1, 9), at(1, 11), 2),
+			block("B", "R1", at(1, 11, 30), at(1, 12), 0.5),
+			block("C", "R1", at(1, 14), at(1, 15), 1)
+		]
+		shifts = get_ripple_shifts(make_config(), records, at(1, 10))
+
+		self.assertEqual(
+			[(values[0], shift) for values, shift in shifts],
+			[("A", datetime.timedelta(hours=1)), ("B", datetime.timedelta(minutes=30))]
+		)
+
+	def test_block_starting_at_the_pushed_end_stays(self):
+		records = [block("A", "R1", at(1, 10), at(1, 11), 1)]
+		self.assertEqual(get_ripple_shifts(make_config(), records, at(1, 10)), [])
+
+	def test_date_blocks_move_by_whole_days(self):
+		records = [
+			block("A", "R1", on(3), on(4)),
+			block("B", "R1", on(5), on(5)),
+			block("C", "R1", on(7), on(7))
+		]
+		shifts = get_ripple_shifts(make_config("Date", duration=False), records, at(3, 12))
+
+		self.assertEqual(
+			[(values[0], shift) for values, shift in shifts],
+			[("A", datetime.timedelta(days=1)), ("B", datetime.timedelta(days=1))]
+		)
+
+	def test_date_block_after_the_pushed_end_day_stays(self):
+		# A moved block ending on the 2nd occupies it up to midnight of the 3rd
+		records = [block("A", "R1", on(3), on(3))]
+		self.assertEqual(get_ripple_shifts(make_config("Date", duration=False), records, at(3)), [])
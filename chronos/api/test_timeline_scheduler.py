@@ -0,0 +1,110 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+import unittest
+
+from chronos.api.timeline_intervals import find_overlaps
+from chronos.api.timeline_scheduler import get_free_gaps, plan_schedule, reserve_slot
+from chronos.tests.utils import at, block, make_config, on
+
+
+def hours(count):
+	return datetime.timedelta(hours=count)
+
+
+def to_records(assignments):
+	"""Turn planned assignments back into block records, to check them like placed blocks"""
+	return [
+		block(assignment["block_name"], assignment["row_id"], assignment["start"], assignment["end"])
+		for assignment in assignments
+	]
+
+
+class TestFreeGaps(unittest.TestCase):
+	def test_gaps_skip_overlapping_busy_time(self):
+		busy = [(at(1, 2), at(1, 4), "A"), (at(1, 3), at(1, 5), "B"), (at(1, 8), at(1, 9), "C")]
+		gaps = get_free_gaps(busy, at(1), at(2))
+
+		self.assertEqual(gaps, [[at(1), at(1, 2)], [at(1, 5), at(1, 8)], [at(1, 9), at(2)]])
+
+	def test_gaps_are_clipped_to_the_window(self):
+		busy = [(at(1, 22), at(1, 23), "A"), (at(1, 23), at(3), "B")]
+		gaps = get_free_gaps(busy, at(1, 12), at(2))
+
+		self.assertEqual(gaps, [[at(1, 12), at(1, 22)]])
+
+	def test_busy_time_before_the_window_is_ignored(self):
+		busy = [(at(1), at(1, 6), "A")]
+		self.assertEqual(get_free_gaps(busy, at(1, 4), at(1, 8)), [[at(1, 6), at(1, 8)]])
+
+
+class TestReserveSlot(unittest.TestCase):
+	def test_partial_reservation_shrinks_the_gap(self):
+		gaps = [[at(1), at(1, 4)], [at(1, 6), at(1, 8)]]
+		reserve_slot(gaps, at(1, 6), hours(1))
+
+		self.assertEqual(gaps, [[at(1), at(1, 4)], [at(1, 7), at(1, 8)]])
+
+	def test_full_reservation_removes_the_gap(self):
+		gaps = [[at(1), at(1, 4)], [at(1, 6), at(1, 8)]]
+		reserve_slot(gaps, at(1), hours(4))
+
+		self.assertEqual(gaps, [[at(1, 6), at(1, 8)]])
+
+
+class TestPlanSchedule(unittest.TestCase):
+	def test_no_block_is_placed_on_top_of_another(self):
+		config = make_config()
+		placed = [
+			block("P1", "R1", at(1, 1), at(1, 3), 2),
+			block("P2", "R1", at(1, 4), at(1, 9), 5),
+			block("P3", "R2", at(1), at(1, 10), 10)
+		]
+		pending = [block(f"N{index}", None, None, None, index % 3 + 1, "Medium") for index in range(12)]
+
+		schedule = plan_schedule(config, pending, placed, ["R1", "R2"], "2025-01-01", "2025-01-01")
+
+		self.assertEqual(schedule["scheduled"] + len(schedule["unscheduled"]), len(pending))
+		self.assertEqual(find_overlaps(config, placed + to_records(schedule["assignments"])), [])
+
+	def test_higher_priority_takes_the_earliest_slot(self):
+		pending = [
+			block("LOW", None, None, None, 1, "Low"),
+			block("URGENT", None, None, None, 1, "Urgent")
+		]
+		schedule = plan_schedule(make_config(), pending, [], ["R1"], "2025-01-01", "2025-01-01")
+
+		self.assertEqual(
+			[(assignment["block_name"], assignment["start"]) for assignment in schedule["assignments"]],
+			[("URGENT", "2025-01-01 00:00:00"), ("LOW", "2025-01-01 01:00:00")]
+		)
+
+	def test_row_order_follows_reserved_slots(self):
+		pending = [block(name, None, None, None, 1) for name in ("A", "B", "C")]
+		schedule = plan_schedule(make_config(), pending, [], ["R1", "R2"], "2025-01-01", "2025-01-01")
+
+		self.assertEqual(
+			[(assignment["row_id"], assignment["start"]) for assignment in schedule["assignments"]],
+			[("R1", "2025-01-01 00:00:00"), ("R2", "2025-01-01 00:00:00"), ("R1", "2025-01-01 01:00:00")]
+		)
+
+	def test_date_blocks_take_whole_days_and_end_inclusive(self):
+		config = make_config("Date", duration=False)
+		placed = [block("P1", "R1", on(1), on(2))]
+		pending = [block("N1", None, on(10), on(11))]
+
+		schedule = plan_schedule(config, pending, placed, ["R1"], "2025-01-01", "2025-01-10")
+		assignment = schedule["assignments"][0]
+
+		self.assertEqual(assignment["start"], "2025-01-03 00:00:00")
+		self.assertEqual(assignment["end"], "2025-01-04 00:00:00")
+
+	def test_block_longer_than_any_gap_is_unscheduled(self):
+		placed = [block("P1", "R1", at(1, 6), at(1, 18), 12)]
+		pending = [block("N1", None, None, None, 8)]
+
+		schedule = plan_schedule(make_config(), pending, placed, ["R1"], "2025-01-01", "2025-01-01")
+
+		self.assertEqual(schedule["assignments"], [])
+		self.assertEqual([entry["block_name"] for entry in schedule["unscheduled"]], ["N1"])
@@ -0,0 +1,127 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import pickle
+import time
+
+import frappe
+
+from chronos.api.timeline_plan import get_block_doctype_configurations, get_row_doctype_configurations
+
+# Per-configuration token, replaced whenever one of its rows or blocks changes
+GENERATION_KEY = "chronos_timeline_generation:{0}"
+DEFAULT_EXPIRY = 600
+
+# Single-flight lock: one worker rebuilds a missing result, the others wait for it
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_generation(configuration_name):
+	"""Get the current cache generation of a configuration"""
+	return frappe.cache().get_value(GENERATION_KEY.format(configuration_name)) or "0"
+
+
+def invalidate_configuration(configuration_name):
+	"""Start a new cache generation; results cached under the old one are never read again"""
+	frappe.cache().set_value(GENERATION_KEY.format(configuration_name), frappe.generate_hash(length=10))
+
+
+def on_document_change(doc, method=None):
+	"""doc_events hook (on_change, on_trash): invalidate cached results of the configurations
+	showing this row or block doctype
+
+	The generation is replaced after commit, so a result rebuilt meanwhile from
+	the old data cannot be stored under the new generation.
+	"""
+	if frappe.flags.in_install or frappe.flags.in_migrate:
+		return
+
+	configurations = (get_block_doctype_configurations().get(doc.doctype) or []) + (
+		get_row_doctype_configurations().get(doc.doctype) or []
+	)
+	if not configurations:
+		return
+
+	pending = frappe.local.flags.setdefault("chronos_invalidated_configurations", set())
+	if not pending:
+		frappe.db.after_commit.add(invalidate_pending_configurations)
+		frappe.db.after_rollback.add(discard_pending_configurations)
+	pending.update(configurations)
+
+
+def invalidate_pending_configurations():
+	"""Start new generations for the configurations changed in this transaction"""
+	for configuration_name in frappe.local.flags.pop("chronos_invalidated_configurations", None) or ():
+		invalidate_configuration(configuration_name)
+
+
+def discard_pending_configurations():
+	frappe.local.flags.pop("chronos_invalidated_configurations", None)
+
+
+def get_permission_scope():
+	"""Hash of what decides which rows and blocks the user can see: roles and user permissions"""
+	from frappe.permissions import get_user_permissions
+
+	scope = [sorted(frappe.get_roles()), get_user_permissions()]
+	return hashlib.sha1(json.dumps(scope, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def get_cache_key(kind, config, params):
+	"""Build the cache key of a `kind` result for `config` with the given request parameters"""
+	digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+	return f"chronos_{kind}:{config.name}:{config.version}:{get_generation(config.name)}:{digest}"
+
+
+def get_cached_result(kind, config, params, builder, expires_in_sec=DEFAULT_EXPIRY):
+	"""Get a cached result for `config`, building and storing it with `builder` on a miss
+
+	Concurrent misses on the same key are single-flight: the worker holding the
+	lock builds the result while the others wait for it to appear.
+	"""
+	cache = frappe.cache()
+	key = get_cache_key(kind, config, params)
+
+	result = cache.get_value(key)
+	if result is not None:
+		return result
+
+	lock_name = f"{key}:lock"
+	lock_key = cache.make_key(lock_name)
+	has_lock = cache.set(lock_key, frappe.local.site, nx=True, ex=LOCK_TIMEOUT)
+	if not has_lock:
+		result = wait_for_result(key, lock_name)
+		if result is not None:
+			return result
+
+	try:
+		result = builder()
+		cache.set_value(key, result, expires_in_sec=expires_in_sec)
+	finally:
+		if has_lock:
+			cache.delete(lock_key)
+
+	return result
+
+
+def wait_for_result(key, lock_name):
+	"""Wait while another worker builds `key`; None if it gives up or fails"""
+	cache = frappe.cache()
+	# Read Redis directly: get_value would keep returning the request-local copy of the earlier miss
+	redis_key = cache.make_key(key)
+	deadline = time.monotonic() + LOCK_TIMEOUT
+	while time.monotonic() < deadline:
+		time.sleep(LOCK_POLL_INTERVAL)
+		# RedisWrapper.exists prefixes the name itself; check the lock first so a
+		# result stored just before it was released is still read below
+		building = cache.exists(lock_name)
+		value = cache.get(redis_key)
+		if value is not None:
+			return pickle.loads(value)
+		if not building:
+			return None
+
+	return None
@@ -2,19 +2,51 @@
 # For license information, please see license.txt
 
 import frappe
-from frappe.utils import getdate, add_days, date_diff
+from frappe.utils import getdate, get_datetime, add_days, date_diff, cint
 from frappe import _
 import json
 
+from chronos.api.change_log import get_tracked_values, record_block_change
+from chronos.api.profiling import profile_endpoint, profile_phase
+from chronos.api.timeline_cache import get_cached_result, get_permission_scope, on_document_change
+from chronos.api.timeline_intervals import aggregate_utilisation, find_overlaps, get_ripple_shifts, iter_block_spans
+from chronos.api.timeline_plan import format_datetime, get_block_values, get_timeline_plan, to_version, unique
+from chronos.api.timeline_snapshot import get_fresh_snapshot
+from chronos.realtime import emit_batch_update, queue_timeline_update
+
+# Seconds the watermark trails the clock, see `get_watermark`
+DEFAULT_WATERMARK_LAG = 60
+
 @frappe.whitelist()
-def get_timeline_data(configuration_name, start_date=None, end_date=None, filters=None):
-	"""Get dynamic timeline data based on configuration"""
+@profile_endpoint
+def get_timeline_data(configuration_name, start_date=None, end_date=None, filters=None, since=None, format=None,
+		row_offset=None, row_limit=None, row_ids=None, include_conflicts=None):
+	"""Get dynamic timeline data based on configuration
+
+	When `since` is passed (the `watermark` of a previous response) only rows and
+	blocks modified after it are returned, together with the names that left the
+	window in `removed_rows` / `removed_blocks`.
+
+	With `format="columnar"` blocks are returned as a schema plus parallel arrays
+	(see `build_block_encoder`) instead of one object per block.
+
+	`row_offset`/`row_limit` or explicit `row_ids` restrict the board to a window
+	of rows (see `get_timeline_row_index`) and only fetch the blocks on them.
+	Unassigned blocks are sent with the first window only.
+
+	`include_conflicts` adds the overlapping blocks per row as `conflicts`.
+
+	Full loads are served from a shared cache keyed on the window, filters and
+	the user's permission scope, see `get_cached_result`. Full boards without a
+	row window are served from a snapshot materialised with
+	`build_timeline_snapshot`, with the changes made since merged in.
+	"""
 	try:
-		# Get configuration
-		config = frappe.get_doc("Timeline Configuration", configuration_name)
+		# Get compiled configuration
+		with profile_phase("config"):
+			config = get_timeline_plan(configuration_name)
 		if not config.is_active:
 			frappe.throw(_("Timeline Configuration is not active"))
-		
 
 		# Parse filters
 		if isinstance(filters, str):
@@ -28,321 +60,516 @@ def get_timeline_data(configuration_name, start_date=None, end_date=None, filter
 		if not end_date:
 			end_date = add_days(start_date, 30)  # Default 30-day range
 
-		# Get row entities (e.g., Workstations)
-		rows = get_row_entities(config, filters)
+		def build_timeline_data():
+			return get_timeline_result(
+				config, start_date, end_date, filters, since, format,
+				row_offset, row_limit, row_ids, include_conflicts
+			)
+
+		# Deltas are specific to one client's watermark, only full loads are shared
+		if since:
+			return build_timeline_data()
+
+		# Long windows may have been materialised in the background
+		if not row_limit and not row_ids and not cint(include_conflicts):
+			with profile_phase("snapshot"):
+				snapshot = get_fresh_snapshot(config, start_date, end_date, filters, format)
+			if snapshot:
+				return snapshot
+
+		return get_cached_result(
+			"timeline",
+			config,
+			{
+				"start_date": start_date,
+				"end_date": end_date,
+				"filters": filters,
+				"format": format,
+				"row_offset": cint(row_offset),
+				"row_limit": cint(row_limit),
+				"row_ids": frappe.parse_json(row_ids) if row_ids else None,
+				"include_conflicts": cint(include_conflicts),
+				"scope": get_permission_scope()
+			},
+			build_timeline_data
+		)
 
-		# Get block entities (e.g., Work Orders)
-		blocks = get_block_entities(config, start_date, end_date, filters)
-		
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Timeline Data Error")
+		return {
+			"success": False,
+			"error": str(e),
+			"rows": [],
+			"blocks": [],
+			"config": None
+		}
 
-		result = {
-			"success": True,
-			"config": {
-				"name": config.name,
-				"configuration_name": config.configuration_name,
-				"description": config.description,
-				"row_doctype": config.row_doctype,
-				"block_doctype": config.block_doctype,
-				"block_to_date_field": config.block_to_date_field,
-				"date_range_end_field": config.date_range_end_field,
-				"block_duration_field": config.block_duration_field,
-				"block_status_field": config.block_status_field,
-				"block_priority_field": config.block_priority_field,
-				"field_mappings": {
-					"row_to_block_field": config.row_to_block_field,
-					"block_to_date_field": config.block_to_date_field,
-					"row_label_field": config.row_label_field,
-					"block_label_field": config.block_label_field,
-					"block_color_field": config.block_color_field,
-					"date_range_end_field": config.date_range_end_field,
-					"block_duration_field": config.block_duration_field,
-					"block_status_field": config.block_status_field,
-					"block_priority_field": config.block_priority_field
+def get_timeline_result(config, start_date, end_date, filters, since=None, format=None, row_offset=None, row_limit=None,
+		row_ids=None, include_conflicts=None):
+	"""Build the `get_timeline_data` response for a parsed request"""
+	# Capture the watermark before reading so concurrent writes are picked up next time
+	watermark = get_watermark()
+
+	# Resolve the row window, if the client asked for one
+	row_window = None
+	if row_ids or row_limit:
+		row_window = get_row_window(config, filters, row_offset, row_limit, row_ids)
+
+	# Get row entities (e.g., Workstations)
+	with profile_phase("rows"):
+		rows = get_row_entities(config, filters, since=since, row_names=row_window)
+
+	# Get block entities (e.g., Work Orders)
+	with profile_phase("query"):
+		records = get_block_records(
+			config, start_date, end_date, filters, since=since,
+			row_names=row_window, include_unassigned=not row_ids and not cint(row_offset)
+		)
+	with profile_phase("format"):
+		blocks = format_block_records(config, records, format, [row["id"] for row in rows])
+
+	result = {
+		"success": True,
+		"config": config.config_payload,
+		"rows": rows,
+		"blocks": blocks,
+		"date_range": {
+			"start_date": start_date,
+			"end_date": end_date
+		},
+		"watermark": watermark
+	}
+
+	if row_window is not None:
+		result["row_window"] = row_window
+
+	if cint(include_conflicts):
+		with profile_phase("conflicts"):
+			result["conflicts"] = find_overlaps(config, records)
+
+	if since:
+		result["delta"] = True
+		result["removed_rows"] = get_removed_row_names(config, since, rows)
+		result["removed_blocks"] = get_removed_block_names(config, since, get_block_names(blocks))
+
+	return result
+
+def get_watermark():
+	"""Get the `since` a client passes back for its next delta
+
+	`modified` is set when a save starts but only becomes visible at commit, so
+	a write committed after this read can carry an older `modified`. The
+	watermark trails the clock by `chronos_watermark_lag` seconds (site config)
+	to pick those up; recent changes are sent again and merged by id.
+	"""
+	lag = cint(frappe.conf.get("chronos_watermark_lag") or DEFAULT_WATERMARK_LAG)
+	return frappe.utils.add_to_date(None, seconds=-lag, as_string=True, as_datetime=True)
+
+@frappe.whitelist()
+@profile_endpoint
+def get_timeline_bundle(configuration_names, start_date=None, end_date=None, filters=None, format=None):
+	"""Get several configurations over one window in one response
+
+	`filters` is keyed on configuration name. Rows are returned once per row
+	doctype in `rows`; each board lists its `row_ids` in its own label order,
+	as sorted by the database like `get_timeline_data`. Boards sharing a row
+	doctype, row filters and label field share one row query.
+	Each board also carries its field metadata and metadata `etag`.
+	"""
+	try:
+		configuration_names = frappe.parse_json(configuration_names) or []
+		filters = frappe.parse_json(filters) or {}
+
+		if not start_date:
+			start_date = frappe.utils.nowdate()
+		if not end_date:
+			end_date = add_days(start_date, 30)
+
+		# Capture the watermark before reading so concurrent writes are picked up next time
+		watermark = get_watermark()
+
+		configs = []
+		for configuration_name in unique(configuration_names):
+			config = get_timeline_plan(configuration_name)
+			if not config.is_active:
+				frappe.throw(_("Timeline Configuration {0} is not active").format(configuration_name))
+			configs.append(config)
+
+		# One row query per row doctype, row filters and label order, reading the fields of every board using it
+		row_queries = {}
+		for config in configs:
+			row_filters = get_row_filters(filters.get(config.name))
+			key = (config.row_doctype, json.dumps(row_filters, sort_keys=True, default=str), config.row_label_field)
+			query = row_queries.setdefault(key, {"filters": row_filters, "fields": [], "configs": []})
+			query["fields"] = unique(query["fields"] + config.row_fields)
+			query["configs"].append(config)
+
+		rows = {}
+		row_label_fields = {}
+		boards = {}
+		for (row_doctype, _filters_key, label_field), query in row_queries.items():
+			records = frappe.get_all(row_doctype, filters=query["filters"], fields=query["fields"], order_by=label_field)
+			row_ids = [record.name for record in records]
+			doctype_rows = rows.setdefault(row_doctype, {})
+			row_label_fields.setdefault(row_doctype, label_field)
+			for record in records:
+				if record.name not in doctype_rows:
+					doctype_rows[record.name] = query["configs"][0].format_row(record)
+
+			for config in query["configs"]:
+				block_records = get_block_records(config, start_date, end_date, filters.get(config.name))
+				boards[config.name] = {
+					"config": config.config_payload,
+					"row_doctype": row_doctype,
+					"row_ids": row_ids,
+					"blocks": format_block_records(config, block_records, format, row_ids),
+					"field_metadata": config.field_metadata,
+					"etag": config.metadata_etag
 				}
-			},
-			"rows": rows,
-			"blocks": blocks,
+
+				# Shared rows carry the label of the first board; boards labelling them differently get their own
+				if label_field != row_label_fields[row_doctype]:
+					boards[config.name]["row_labels"] = {
+						record.name: record.get(label_field) or record.name for record in records
+					}
+
+		return {
+			"success": True,
+			"rows": {row_doctype: list(doctype_rows.values()) for row_doctype, doctype_rows in rows.items()},
+			"boards": boards,
 			"date_range": {
 				"start_date": start_date,
 				"end_date": end_date
-			}
+			},
+			"watermark": watermark
 		}
-		
-		return result
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "Timeline Data Error")
+		frappe.log_error(frappe.get_traceback(), "Timeline Bundle Error")
 		return {
 			"success": False,
-			"error": str(e),
-			"rows": [],
-			"blocks": [],
-			"config": None
+			"error": str(e)
 		}
 
-def get_row_entities(config, filters=None):
+def get_row_entities(config, filters=None, since=None, row_names=None):
 	"""Get row entities based on configuration"""
 	try:
 		# Build filters for row doctype
-		row_filters = {}
-		if filters and filters.get("row_filters"):
-			row_filters.update(filters["row_filters"])
+		row_filters = get_row_filters(filters)
 
-		# Get required fields
-		fields = ["name", config.row_label_field]
+		# Restrict to the requested row window
+		if row_names is not None:
+			row_filters["name"] = ["in", row_names]
 
-		# Add additional fields that might be useful
-		row_meta = frappe.get_meta(config.row_doctype)
-		additional_fields = ["status", "department", "company", "disabled"]
-		for field in additional_fields:
-			if row_meta.get_field(field):
-				fields.append(field)
-
-		# Remove duplicates
-		fields = list(set(fields))
+		# Only rows changed after the client's watermark
+		if since:
+			row_filters["modified"] = [">=", since]
 
 		# Get row entities
 		rows = frappe.get_all(
 			config.row_doctype,
 			filters=row_filters,
-			fields=fields,
+			fields=config.row_fields,
 			order_by=config.row_label_field
 		)
 
-		# Format row data
-		formatted_rows = []
-		for row in rows:
-			formatted_row = {
-				"id": row.name,
-				"name": row.name,
-				"label": row.get(config.row_label_field) or row.name,
-				"doctype": config.row_doctype
-			}
+		return [config.format_row(row) for row in rows]
 
-			# Add additional fields
-			for field in fields:
-				if field not in ["name", config.row_label_field]:
-					formatted_row[field] = row.get(field)
+	except Exception as e:
+		return []
 
-			formatted_rows.append(formatted_row)
+def get_block_entities(config, start_date, end_date, filters=None, since=None, format=None, row_ids=(),
+		row_names=None, include_unassigned=True):
+	"""Get block entities based on configuration and date range"""
+	try:
+		blocks = get_block_records(
+			config, start_date, end_date, filters, since=since,
+			row_names=row_names, include_unassigned=include_unassigned
+		)
 
-		return formatted_rows
+		return format_block_records(config, blocks, format, row_ids)
 
 	except Exception as e:
 		return []
 
-def get_block_entities(config, start_date, end_date, filters=None):
-	"""Get block entities based on configuration and date range"""
+def format_block_records(config, records, format=None, row_ids=()):
+	"""Format block records as block objects, or as one columnar payload"""
+	if format == "columnar":
+		return config.encode_blocks(records, row_ids)
+
+	format_block = config.format_block
+	return [format_block(values) for values in records]
+
+def get_block_records(config, start_date, end_date, filters=None, since=None, row_names=None, include_unassigned=True):
+	"""Get block records in the window as value tuples in `config.block_fields` order"""
+	# Build filters for block doctype
+	block_filters = {}
+	if filters and filters.get("block_filters"):
+		block_filters.update(filters["block_filters"])
+
+	# Only blocks changed after the client's watermark
+	if since:
+		block_filters["modified"] = [">=", since]
+
+	# Add date range filter
+	block_filters.update(config.get_date_filters(start_date, end_date))
+
+	# Only blocks on the requested rows, plus unassigned ones if asked for
+	or_filters = None
+	if row_names is not None:
+		if include_unassigned:
+			or_filters = [
+				[config.row_to_block_field, "in", row_names],
+				[config.row_to_block_field, "is", "not set"]
+			]
+		else:
+			block_filters[config.row_to_block_field] = ["in", row_names]
+
+	# Get block entities as plain value tuples, one query
+	return frappe.get_all(
+		config.block_doctype,
+		filters=block_filters,
+		or_filters=or_filters,
+		fields=config.block_fields,
+		order_by=config.block_order_by,
+		as_list=True
+	)
+
+def get_row_filters(filters=None):
+	"""Get the row doctype filters from the board filters"""
+	row_filters = {}
+	if filters and filters.get("row_filters"):
+		row_filters.update(filters["row_filters"])
+
+	return row_filters
+
+def get_row_window(config, filters, row_offset=None, row_limit=None, row_ids=None):
+	"""Get the names of the rows in the requested window, in board order"""
+	row_filters = get_row_filters(filters)
+	if row_ids:
+		row_filters["name"] = ["in", frappe.parse_json(row_ids)]
+
+	return frappe.get_all(
+		config.row_doctype,
+		filters=row_filters,
+		order_by=config.row_label_field,
+		limit_start=cint(row_offset),
+		limit_page_length=cint(row_limit),
+		pluck="name"
+	)
+
+def get_removed_row_names(config, since, rows):
+	"""Get rows changed or deleted after `since` that are no longer part of the board"""
+	kept = {row["name"] for row in rows}
+	changed = frappe.get_all(config.row_doctype, filters={"modified": [">=", since]}, pluck="name")
+
+	return [name for name in changed if name not in kept] + get_deleted_names(config.row_doctype, since)
+
+def get_removed_block_names(config, since, kept):
+	"""Get blocks changed or deleted after `since` that left the window or no longer match the filters"""
+	changed = frappe.get_all(config.block_doctype, filters={"modified": [">=", since]}, pluck="name")
+
+	return [name for name in changed if name not in kept] + get_deleted_names(config.block_doctype, since)
+
+def get_block_names(blocks):
+	"""Get the names of blocks in either payload format"""
+	if isinstance(blocks, dict):
+		return set(blocks["columns"][0])
+	return {block["name"] for block in blocks}
+
+def get_deleted_names(doctype, since):
+	"""Get names of documents of `doctype` deleted after `since`"""
+	return frappe.get_all(
+		"Deleted Document",
+		filters={"deleted_doctype": doctype, "creation": [">=", since]},
+		pluck="deleted_name"
+	)
+
+@frappe.whitelist()
+@profile_endpoint
+def get_timeline_row_index(configuration_name, filters=None):
+	"""Get the row count and the id/label of every row, for lazily loading row windows"""
 	try:
-		# Build filters for block doctype
-		block_filters = {}
-		if filters and filters.get("block_filters"):
-			block_filters.update(filters["block_filters"])
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
 
-		# Add date range filter
-		date_field = config.block_to_date_field
-		
-		if config.date_range_end_field:
-			# Handle date range blocks (block_to_date_field is start, date_range_end_field is end)
-			date_filters = {
-				config.block_to_date_field: ["<=", end_date],
-				config.date_range_end_field: [">=", start_date]
-			}
-			block_filters.update(date_filters)
-		else:
-			# Handle single date blocks
-			single_filter = {date_field: ["between", [start_date, end_date]]}
-			block_filters.update(single_filter)
-
-		# Get required fields
-		fields = [
-			"name",
-			config.row_to_block_field,
-			config.block_to_date_field,
-			config.block_label_field
-		]
-
-		# Add optional fields if they exist
-		optional_fields = [
-			config.block_color_field,
-			config.date_range_end_field,
-			config.block_duration_field,
-			config.block_status_field,
-			config.block_priority_field
-		]
-
-		for field in optional_fields:
-			if field:
-				fields.append(field)
-
-		# Add common useful fields
-		block_meta = frappe.get_meta(config.block_doctype)
-		additional_fields = ["status", "priority", "progress", "description", "owner", "creation", "modified"]
-		for field in additional_fields:
-			if block_meta.get_field(field) and field not in fields:
-				fields.append(field)
-
-		# Remove duplicates and None values
-		fields = list(set([f for f in fields if f]))
-
-		# Get block entities
-		blocks = frappe.get_all(
-			config.block_doctype,
-			filters=block_filters,
-			fields=fields,
-			order_by=f"{config.block_to_date_field} asc"
+		if isinstance(filters, str):
+			filters = json.loads(filters) if filters else {}
+
+		rows = frappe.get_all(
+			config.row_doctype,
+			filters=get_row_filters(filters),
+			fields=["name", config.row_label_field],
+			order_by=config.row_label_field,
+			as_list=True
 		)
 
-		# Format block data
-		formatted_blocks = []
-		for block in blocks:
-			# Format the main date field consistently  
-			main_date = block.get(config.block_to_date_field)
-			if main_date and not isinstance(main_date, str) and hasattr(main_date, 'strftime'):
-				main_date = main_date.strftime("%Y-%m-%d %H:%M:%S")
-			
-			formatted_block = {
-				"id": block.name,
-				"name": block.name,
-				"label": block.get(config.block_label_field) or block.name,
-				"doctype": config.block_doctype,
-				"row_id": block.get(config.row_to_block_field),
-				"date": main_date
-			}
+		return {
+			"success": True,
+			"total": len(rows),
+			"rows": [[name, label or name] for name, label in rows]
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Timeline Row Index Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
 
-			# Add date range if available (block_to_date_field is start, date_range_end_field is end)
-			if config.date_range_end_field:
-				start_date_val = block.get(config.block_to_date_field)
-				end_date_val = block.get(config.date_range_end_field)
-				
-				# Format dates consistently - ensure they're in YYYY-MM-DD HH:MM:SS format for frontend
-				if start_date_val:
-					if isinstance(start_date_val, str):
-						formatted_block["start_date"] = start_date_val
-					else:
-						formatted_block["start_date"] = start_date_val.strftime("%Y-%m-%d %H:%M:%S") if hasattr(start_date_val, 'strftime') else str(start_date_val)
-				
-				if end_date_val:
-					if isinstance(end_date_val, str):
-						formatted_block["end_date"] = end_date_val
-					else:
-						formatted_block["end_date"] = end_date_val.strftime("%Y-%m-%d %H:%M:%S") if hasattr(end_date_val, 'strftime') else str(end_date_val)
-				
-
-			# Add optional fields
-			if config.block_duration_field:
-				formatted_block["duration"] = block.get(config.block_duration_field) or 0
-
-			if config.block_status_field:
-				formatted_block["status"] = block.get(config.block_status_field)
-
-			if config.block_priority_field:
-				formatted_block["priority"] = block.get(config.block_priority_field)
-
-			if config.block_color_field:
-				formatted_block["color"] = block.get(config.block_color_field)
-
-			# Add other useful fields
-			for field in ["progress", "description", "owner", "creation", "modified"]:
-				if field in fields:
-					formatted_block[field] = block.get(field)
-
-			formatted_blocks.append(formatted_block)
-
-		return formatted_blocks
+@frappe.whitelist()
+@profile_endpoint
+def get_timeline_conflicts(configuration_name, start_date=None, end_date=None, filters=None):
+	"""Get the overlapping blocks per row in the window"""
+	try:
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		if isinstance(filters, str):
+			filters = json.loads(filters) if filters else {}
+
+		if not start_date:
+			start_date = frappe.utils.nowdate()
+		if not end_date:
+			end_date = add_days(start_date, 30)
+
+		records = get_block_records(config, start_date, end_date, filters)
+
+		return {
+			"success": True,
+			"conflicts": find_overlaps(config, records)
+		}
 
 	except Exception as e:
-		return []
+		frappe.log_error(frappe.get_traceback(), "Timeline Conflicts Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
 
 @frappe.whitelist()
-def update_block_assignment(block_doctype, block_name, new_row_assignment, new_date=None, new_datetime=None, config_name=None):
-	"""Update block assignment to a different row or date/datetime"""
+@profile_endpoint
+def get_timeline_utilisation(configuration_name, start_date=None, end_date=None, bucket="day", filters=None):
+	"""Get the load per row per day/week bucket as a compact rows x buckets matrix"""
 	try:
-		# Get the block document
-		block_doc = frappe.get_doc(block_doctype, block_name)
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		if bucket not in ("day", "week"):
+			frappe.throw(_("Bucket must be 'day' or 'week'"))
+
+		if isinstance(filters, str):
+			filters = json.loads(filters) if filters else {}
+
+		if not start_date:
+			start_date = frappe.utils.nowdate()
+		if not end_date:
+			end_date = add_days(start_date, 30)
+
+		def build_utilisation():
+			row_names = [row["name"] for row in get_row_entities(config, filters)]
+			records = get_block_records(config, start_date, end_date, filters)
+			return aggregate_utilisation(config, records, row_names, start_date, end_date, bucket)
+
+		utilisation = get_cached_result(
+			"utilisation",
+			config,
+			{
+				"start_date": start_date,
+				"end_date": end_date,
+				"bucket": bucket,
+				"filters": filters,
+				"scope": get_permission_scope()
+			},
+			build_utilisation
+		)
+
+		return {
+			"success": True,
+			**utilisation
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Timeline Utilisation Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
 
+@frappe.whitelist()
+@profile_endpoint
+def update_block_assignment(block_doctype, block_name, new_row_assignment, new_date=None, new_datetime=None, config_name=None,
+		ripple=0, dry_run=0, fast=0, version=None):
+	"""Update block assignment to a different row or date/datetime
+
+	`version` is the block's version token from `get_timeline_data`. When the
+	block changed since, nothing is written and a conflict response carrying
+	the current block is returned instead.
+
+	With `ripple` the blocks after it on the target row are pushed forward so
+	they no longer overlap; with `dry_run` nothing is saved and only the
+	blocks that would move are returned.
+
+	With `fast` (needs `config_name`) only the configured fields are loaded and
+	written with a targeted update instead of a full document save, and only
+	the changed fields are returned. The row link and date order are checked,
+	the DocType controller does not run.
+	"""
+	try:
 		# Get configuration if provided
 		config = None
 		if config_name:
-			config = frappe.get_doc("Timeline Configuration", config_name)
-
-		# Store old values for logging
-		old_row_assignment = None
-		old_date = None
-
-		# Update row assignment
-		if new_row_assignment and config:
-			old_row_assignment = getattr(block_doc, config.row_to_block_field, None)
-			setattr(block_doc, config.row_to_block_field, new_row_assignment)
-
-		# Update date/datetime if provided
-		if (new_date or new_datetime) and config:
-			old_date = getattr(block_doc, config.block_to_date_field, None)
-			
-			# Use datetime if provided, otherwise fall back to date
-			if new_datetime:
-				# Parse the ISO datetime string
-				from datetime import datetime
-				dt = datetime.fromisoformat(new_datetime.replace('Z', '+00:00'))
-				setattr(block_doc, config.block_to_date_field, dt)
-			elif new_date:
-				setattr(block_doc, config.block_to_date_field, getdate(new_date))
-
-		# Handle date range updates if applicable
-		if config and config.date_range_end_field and (new_date or new_datetime):
-			# If block has date range, update both start and end dates
-			current_start = getattr(block_doc, config.block_to_date_field, None)
-			current_end = getattr(block_doc, config.date_range_end_field, None)
-
-			if current_start and current_end:
-				# Calculate duration based on original type (date vs datetime)
-				if new_datetime:
-					from datetime import datetime, timedelta
-					# For datetime fields, preserve time differences
-					if isinstance(current_start, datetime) and isinstance(current_end, datetime):
-						duration = current_end - current_start
-						new_start_dt = datetime.fromisoformat(new_datetime.replace('Z', '+00:00'))
-						new_end_dt = new_start_dt + duration
-						
-						# Update both start and end datetimes
-						setattr(block_doc, config.block_to_date_field, new_start_dt)
-						setattr(block_doc, config.date_range_end_field, new_end_dt)
-					else:
-						# Fallback to date handling
-						duration = date_diff(current_end, current_start)
-						new_start_date = getdate(new_datetime.split('T')[0])
-						new_end_date = add_days(new_start_date, duration)
-						
-						setattr(block_doc, config.block_to_date_field, new_start_date)
-						setattr(block_doc, config.date_range_end_field, new_end_date)
-				else:
-					# Date-only handling
-					duration = date_diff(current_end, current_start)
-					new_start_date = getdate(new_date)
-					new_end_date = add_days(new_start_date, duration)
+			config = get_timeline_plan(config_name)
 
-					# block_to_date_field is the start date
-					setattr(block_doc, config.block_to_date_field, new_start_date)
-					setattr(block_doc, config.date_range_end_field, new_end_date)
+		# Get the block document, or just its configured fields for a fast move
+		if cint(fast):
+			if not config:
+				frappe.throw(_("Fast moves need a timeline configuration"))
+			block_doc = get_block_fields(config, block_name, for_update=bool(version))
+		else:
+			block_doc = frappe.get_doc(block_doctype, block_name, for_update=bool(version))
+
+		# Reject the move if the block changed since the client loaded it
+		if is_stale_version(block_doc, version):
+			return get_conflict_response(config, block_doc)
+
+		# Apply the move
+		old_values = get_tracked_values(config, block_doc) if config else None
+		changes = apply_block_move(block_doc, config, new_row_assignment, new_date, new_datetime)
+
+		# Work out the blocks pushed forward by the move
+		ripple_updates = get_ripple_updates(config, block_doc) if cint(ripple) else []
+		if cint(dry_run):
+			return {
+				"success": True,
+				"dry_run": True,
+				"rippled": format_ripple_updates(config, ripple_updates)
+			}
 
 		# Save the document
-		block_doc.save(ignore_permissions=True)
+		if cint(fast):
+			block = save_block_fields(config, block_doc, old_values)
+		else:
+			block_doc.save(ignore_permissions=True)
+			block = block_doc.as_dict()
+		if config:
+			record_block_change(config, block_doc, "move", old_values)
+		rippled_at = apply_ripple_updates(config, ripple_updates)
 		frappe.db.commit()
 
-		# Log the change
-		frappe.log_error(
-			f"Block {block_name} moved from {old_row_assignment} to {new_row_assignment}, date: {old_date} to {new_date}",
-			"Block Assignment Update"
-		)
-
 		return {
 			"success": True,
 			"message": "Block assignment updated successfully",
-			"block": block_doc.as_dict(),
-			"old_row_assignment": old_row_assignment,
+			"block": block,
+			"version": to_version(block_doc.modified),
+			"old_row_assignment": changes["old_row_assignment"],
 			"new_row_assignment": new_row_assignment,
-			"old_date": old_date,
-			"new_date": new_date
+			"old_date": changes["old_date"],
+			"new_date": new_date,
+			"rippled": format_ripple_updates(config, ripple_updates, rippled_at)
 		}
 
 	except Exception as e:
@@ -353,7 +580,73 @@ def update_block_assignment(block_doctype, block_name, new_row_assignment, new_d
 			"error": str(e)
 		}
 
+def get_block_fields(config, block_name, for_update=False):
+	"""Load only the configured fields of a block, for the fast write path"""
+	block = frappe.db.get_value(
+		config.block_doctype, block_name, unique(config.block_fields + ["docstatus", "modified"]), as_dict=True,
+		for_update=for_update
+	)
+	if not block:
+		frappe.throw(_("{0} {1} not found").format(_(config.block_doctype), block_name), frappe.DoesNotExistError)
+	if block.docstatus != 0:
+		frappe.throw(_("Cannot move a submitted or cancelled {0}").format(_(config.block_doctype)))
+
+	block.doctype = config.block_doctype
+	return block
+
+def save_block_fields(config, block, old_values):
+	"""Write the changed row/date fields of a block loaded by `get_block_fields`; returns the changed fields"""
+	new_values = get_tracked_values(config, block)
+	fields = {
+		"row": config.row_to_block_field,
+		"start": config.block_to_date_field,
+		"end": config.date_range_end_field
+	}
+	changed = {fields[key]: new_values[key] for key in fields if fields[key] and new_values[key] != old_values[key]}
+
+	# Validate only what a move can break: the row link and the date order
+	row_value = changed.get(config.row_to_block_field)
+	if row_value and config.row_link and not frappe.db.exists(config.row_link["doctype"], row_value):
+		frappe.throw(_("Invalid {0}: {1} does not exist in {2}").format(
+			config.row_link["label"], row_value, config.row_link["doctype"]
+		))
+	if new_values["start"] and new_values["end"] and get_datetime(new_values["end"]) < get_datetime(new_values["start"]):
+		frappe.throw(_("End date cannot be before start date"))
+
+	block.modified = frappe.utils.now_datetime()
+	frappe.db.set_value(
+		config.block_doctype,
+		block.name,
+		dict(changed, modified=block.modified, modified_by=frappe.session.user),
+		update_modified=False
+	)
+
+	# set_value skips the doc_events, so invalidate caches and publish the diff here
+	on_document_change(block)
+	queue_timeline_update(config, block)
+
+	return dict(changed, name=block.name, modified=str(block.modified))
+
+def is_stale_version(block_doc, version):
+	"""Check a client's version token against the block's current `modified`"""
+	return bool(version) and to_version(block_doc.modified) != version
+
+def get_conflict_response(config, block_doc):
+	"""Compact response for a rejected stale write, carrying the block as it is now"""
+	if config:
+		block = config.format_block(get_block_values(config, block_doc))
+	else:
+		block = {"name": block_doc.name, "version": to_version(block_doc.modified)}
+
+	return {
+		"success": False,
+		"conflict": True,
+		"error": _("{0} was changed by someone else").format(block_doc.name),
+		"block": block
+	}
+
 @frappe.whitelist()
+@profile_endpoint
 def get_timeline_configurations():
 	"""Get available timeline configurations for selection"""
 	try:
@@ -365,82 +658,344 @@ def get_timeline_configurations():
 
 
 @frappe.whitelist()
-def update_block_date_range(block_doctype, block_name, new_duration=None, new_start_date=None, new_end_date=None, config_name=None, direction='right'):
-	"""Update block date range for resizing operations"""
+@profile_endpoint
+def update_block_date_range(block_doctype, block_name, new_duration=None, new_start_date=None, new_end_date=None, config_name=None, direction='right',
+		ripple=0, dry_run=0, version=None):
+	"""Update block date range for resizing operations
+
+	`ripple`, `dry_run` and `version` work as in `update_block_assignment`.
+	"""
 	try:
 		# Get the block document
-		block_doc = frappe.get_doc(block_doctype, block_name)
+		block_doc = frappe.get_doc(block_doctype, block_name, for_update=bool(version))
 
 		# Get configuration if provided
 		config = None
 		if config_name:
-			config = frappe.get_doc("Timeline Configuration", config_name)
+			config = get_timeline_plan(config_name)
+
+		# Reject the resize if the block changed since the client loaded it
+		if is_stale_version(block_doc, version):
+			return get_conflict_response(config, block_doc)
+
+		# Apply the resize
+		old_values = get_tracked_values(config, block_doc) if config else None
+		changes = apply_block_resize(block_doc, config, new_duration, new_start_date, new_end_date)
+
+		# Work out the blocks pushed forward by the resize
+		ripple_updates = get_ripple_updates(config, block_doc) if cint(ripple) else []
+		if cint(dry_run):
+			return {
+				"success": True,
+				"dry_run": True,
+				"rippled": format_ripple_updates(config, ripple_updates)
+			}
 
-		# Store old values for logging
-		old_start_date = None
-		old_end_date = None
-		old_duration = None
+		# Save the document
+		block_doc.save(ignore_permissions=True)
+		if config:
+			record_block_change(config, block_doc, "resize", old_values)
+		rippled_at = apply_ripple_updates(config, ripple_updates)
+		frappe.db.commit()
 
-		if config and config.date_range_end_field:
-			# Handle date range blocks (block_to_date_field is start, date_range_end_field is end)
-			old_start_date = getattr(block_doc, config.block_to_date_field, None)
-			old_end_date = getattr(block_doc, config.date_range_end_field, None)
-			
-			if config.block_duration_field:
-				old_duration = getattr(block_doc, config.block_duration_field, None)
+		return {
+			"success": True,
+			"message": "Block date range updated successfully",
+			"block": block_doc.as_dict(),
+			"version": to_version(block_doc.modified),
+			"old_start_date": changes["old_start_date"],
+			"new_start_date": new_start_date,
+			"old_end_date": changes["old_end_date"],
+			"new_end_date": new_end_date,
+			"old_duration": changes["old_duration"],
+			"new_duration": new_duration,
+			"rippled": format_ripple_updates(config, ripple_updates, rippled_at)
+		}
 
-			# Update start date if provided (using block_to_date_field)
-			if new_start_date:
-				setattr(block_doc, config.block_to_date_field, getdate(new_start_date))
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Update Block Date Range Error")
+		frappe.db.rollback()
+		return {
+			"success": False,
+			"error": str(e)
+		}
 
-			# Update end date if provided
-			if new_end_date:
-				setattr(block_doc, config.date_range_end_field, getdate(new_end_date))
 
-			# Update duration if provided and field exists
-			if new_duration and config.block_duration_field:
-				setattr(block_doc, config.block_duration_field, new_duration)
+@frappe.whitelist()
+@profile_endpoint
+def bulk_update_blocks(operations, config_name):
+	"""Apply a list of move/resize operations in one transaction
+
+	Each operation is `{"action": "move", "block_name", "new_row_assignment",
+	"new_date", "new_datetime"}` or `{"action": "resize", "block_name",
+	"new_duration", "new_start_date", "new_end_date"}`, optionally with the
+	block's `version`. A failing or stale operation is rolled back on its own
+	and reported in `results`; the rest are committed once.
+	"""
+	try:
+		operations = frappe.parse_json(operations) or []
 
-			# block_to_date_field is already updated above as the start date
+		config = get_timeline_plan(config_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
 
-		else:
-			# Handle single date blocks with duration
-			if config and config.block_duration_field and new_duration:
-				old_duration = getattr(block_doc, config.block_duration_field, None)
-				setattr(block_doc, config.block_duration_field, new_duration)
+		results = []
+		updated_docs = []
+		for index, operation in enumerate(operations):
+			block_name = operation.get("block_name")
+			savepoint = f"chronos_bulk_{index}"
+			frappe.db.savepoint(savepoint)
+
+			try:
+				version = operation.get("version")
+				block_doc = frappe.get_doc(config.block_doctype, block_name, for_update=bool(version))
+				if is_stale_version(block_doc, version):
+					results.append({"block_name": block_name, **get_conflict_response(config, block_doc)})
+					continue
+
+				old_values = get_tracked_values(config, block_doc)
+
+				action = operation.get("action") or "move"
+				if action == "move":
+					changes = apply_block_move(
+						block_doc, config,
+						operation.get("new_row_assignment"),
+						operation.get("new_date"),
+						operation.get("new_datetime")
+					)
+				elif action == "resize":
+					changes = apply_block_resize(
+						block_doc, config,
+						operation.get("new_duration"),
+						operation.get("new_start_date"),
+						operation.get("new_end_date")
+					)
+				else:
+					frappe.throw(_("Unknown block operation: {0}").format(action))
+
+				block_doc.save(ignore_permissions=True)
+				record_block_change(config, block_doc, action, old_values)
+				updated_docs.append(block_doc)
+				results.append({
+					"block_name": block_name,
+					"action": action,
+					"success": True,
+					"version": to_version(block_doc.modified),
+					**changes
+				})
+
+			except Exception as e:
+				frappe.db.rollback(save_point=savepoint)
+				results.append({"block_name": block_name, "success": False, "error": str(e)})
 
-		# Save the document
-		block_doc.save(ignore_permissions=True)
 		frappe.db.commit()
 
-		# Log the change
-		frappe.log_error(
-			f"Block {block_name} resized - Duration: {old_duration} to {new_duration}, Dates: {old_start_date} - {old_end_date} to {new_start_date} - {new_end_date}",
-			"Block Resize Update"
-		)
+		if updated_docs:
+			emit_batch_update(updated_docs)
 
 		return {
 			"success": True,
-			"message": "Block date range updated successfully",
-			"block": block_doc.as_dict(),
-			"old_start_date": old_start_date,
-			"new_start_date": new_start_date,
-			"old_end_date": old_end_date,
-			"new_end_date": new_end_date,
-			"old_duration": old_duration,
-			"new_duration": new_duration
+			"updated": len(updated_docs),
+			"failed": len(results) - len(updated_docs),
+			"results": results
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "Update Block Date Range Error")
+		frappe.log_error(frappe.get_traceback(), "Bulk Update Blocks Error")
 		frappe.db.rollback()
 		return {
 			"success": False,
 			"error": str(e)
 		}
 
+def apply_block_move(block_doc, config, new_row_assignment, new_date=None, new_datetime=None):
+	"""Move a loaded block to another row and/or start date, keeping its duration. Returns the old values."""
+	# Store old values for logging
+	old_row_assignment = None
+	old_date = None
+
+	# Update row assignment
+	if new_row_assignment and config:
+		old_row_assignment = getattr(block_doc, config.row_to_block_field, None)
+		setattr(block_doc, config.row_to_block_field, new_row_assignment)
+
+	# Update date/datetime if provided
+	if (new_date or new_datetime) and config:
+		old_date = getattr(block_doc, config.block_to_date_field, None)
+		
+		# Use datetime if provided, otherwise fall back to date
+		if new_datetime:
+			# Parse the ISO datetime string
+			from datetime import datetime
+			dt = datetime.fromisoformat(new_datetime.replace('Z', '+00:00'))
+			setattr(block_doc, config.block_to_date_field, dt)
+		elif new_date:
+			setattr(block_doc, config.block_to_date_field, getdate(new_date))
+
+	# Handle date range updates if applicable
+	if config and config.date_range_end_field and (new_date or new_datetime):
+		# If block has date range, update both start and end dates
+		current_start = getattr(block_doc, config.block_to_date_field, None)
+		current_end = getattr(block_doc, config.date_range_end_field, None)
+
+		if current_start and current_end:
+			# Calculate duration based on original type (date vs datetime)
+			if new_datetime:
+				from datetime import datetime, timedelta
+				# For datetime fields, preserve time differences
+				if isinstance(current_start, datetime) and isinstance(current_end, datetime):
+					duration = current_end - current_start
+					new_start_dt = datetime.fromisoformat(new_datetime.replace('Z', '+00:00'))
+					new_end_dt = new_start_dt + duration
+					
+					# Update both start and end datetimes
+					setattr(block_doc, config.block_to_date_field, new_start_dt)
+					setattr(block_doc, config.date_range_end_field, new_end_dt)
+				else:
+					# Fallback to date handling
+					duration = date_diff(current_end, current_start)
+					new_start_date = getdate(new_datetime.split('T')[0])
+					new_end_date = add_days(new_start_date, duration)
+					
+					setattr(block_doc, config.block_to_date_field, new_start_date)
+					setattr(block_doc, config.date_range_end_field, new_end_date)
+			else:
+				# Date-only handling
+				duration = date_diff(current_end, current_start)
+				new_start_date = getdate(new_date)
+				new_end_date = add_days(new_start_date, duration)
+
+				# block_to_date_field is the start date
+				setattr(block_doc, config.block_to_date_field, new_start_date)
+				setattr(block_doc, config.date_range_end_field, new_end_date)
+
+	return {
+		"old_row_assignment": old_row_assignment,
+		"old_date": old_date
+	}
+
+def apply_block_resize(block_doc, config, new_duration=None, new_start_date=None, new_end_date=None):
+	"""Change the date range and/or duration of a loaded block. Returns the old values."""
+	# Store old values for logging
+	old_start_date = None
+	old_end_date = None
+	old_duration = None
+
+	if config and config.date_range_end_field:
+		# Handle date range blocks (block_to_date_field is start, date_range_end_field is end)
+		old_start_date = getattr(block_doc, config.block_to_date_field, None)
+		old_end_date = getattr(block_doc, config.date_range_end_field, None)
+		
+		if config.block_duration_field:
+			old_duration = getattr(block_doc, config.block_duration_field, None)
+
+		# Update start date if provided (using block_to_date_field)
+		if new_start_date:
+			setattr(block_doc, config.block_to_date_field, getdate(new_start_date))
+
+		# Update end date if provided
+		if new_end_date:
+			setattr(block_doc, config.date_range_end_field, getdate(new_end_date))
+
+		# Update duration if provided and field exists
+		if new_duration and config.block_duration_field:
+			setattr(block_doc, config.block_duration_field, new_duration)
+
+		# block_to_date_field is already updated above as the start date
+
+	else:
+		# Handle single date blocks with duration
+		if config and config.block_duration_field and new_duration:
+			old_duration = getattr(block_doc, config.block_duration_field, None)
+			setattr(block_doc, config.block_duration_field, new_duration)
+
+	return {
+		"old_start_date": old_start_date,
+		"old_end_date": old_end_date,
+		"old_duration": old_duration
+	}
+
+def get_ripple_updates(config, block_doc):
+	"""Get `(values, updates)` for the blocks on the row of `block_doc` that it now pushes forward"""
+	if not config:
+		frappe.throw(_("Ripple rescheduling needs a timeline configuration"))
+
+	spans = list(iter_block_spans(config, [get_block_values(config, block_doc)]))
+	if not spans:
+		return []
+
+	row, start, end, values = spans[0]
+	following = frappe.get_all(
+		config.block_doctype,
+		filters={
+			config.row_to_block_field: row,
+			config.block_to_date_field: [">=", block_doc.get(config.block_to_date_field)],
+			"name": ["!=", block_doc.name]
+		},
+		fields=config.block_fields,
+		order_by=f"{config.block_to_date_field} asc, name asc",
+		as_list=True
+	)
+
+	column = {field: index for index, field in enumerate(config.block_fields)}
+	updates = []
+	for values, shift in get_ripple_shifts(config, following, end):
+		changes = {}
+		for field in (config.block_to_date_field, config.date_range_end_field):
+			if field and values[column[field]]:
+				changes[field] = values[column[field]] + shift
+		updates.append((values, changes))
+
+	return updates
+
+def format_ripple_updates(config, ripple_updates, modified=None):
+	"""Describe rippled blocks with their old and new start/end, and their new version once written"""
+	name_index = config.block_fields.index("name") if config else None
+	rippled = []
+	for values, changes in ripple_updates:
+		entry = {"block_name": values[name_index]}
+		for key, field in (("start", config.block_to_date_field), ("end", config.date_range_end_field)):
+			if field in changes:
+				entry[f"old_{key}"] = format_datetime(values[config.block_fields.index(field)])
+				entry[f"new_{key}"] = format_datetime(changes[field])
+		if modified:
+			entry["version"] = to_version(modified)
+		rippled.append(entry)
+
+	return rippled
+
+def apply_ripple_updates(config, ripple_updates):
+	"""Write the rippled dates in one bulk update and log and publish them like saved blocks
+
+	Returns the `modified` written, which the rippled blocks' versions derive from.
+	"""
+	if not ripple_updates:
+		return None
+
+	# Write the same `modified` that is logged and published, so versions match the database
+	now = frappe.utils.now_datetime()
+	name_index = config.block_fields.index("name")
+	frappe.db.bulk_update(
+		config.block_doctype,
+		{values[name_index]: changes for values, changes in ripple_updates},
+		modified=now
+	)
+
+	# bulk_update skips the doc_events, so log and publish here
+	for values, changes in ripple_updates:
+		block = frappe._dict(zip(config.block_fields, values))
+		block.doctype = config.block_doctype
+		old_values = get_tracked_values(config, block)
+		block.update(changes)
+		block.modified = now
+
+		record_block_change(config, block, "ripple", old_values)
+		queue_timeline_update(config, block)
+
+	return now
 
 @frappe.whitelist()
+@profile_endpoint
 def create_dynamic_block(block_data, configuration_name):
 	"""Create a new block based on dynamic configuration"""
 	try:
@@ -448,45 +1003,18 @@ def create_dynamic_block(block_data, configuration_name):
 		if isinstance(block_data, str):
 			block_data = json.loads(block_data)
 		
-		# Get configuration
-		config = frappe.get_doc("Timeline Configuration", configuration_name)
+		# Get compiled configuration
+		config = get_timeline_plan(configuration_name)
 		if not config.is_active:
 			frappe.throw(_("Timeline Configuration is not active"))
-		
-		
-		# Get the block meta to check field types
-		block_meta = frappe.get_meta(config.block_doctype)
-		
-		# Process row assignment field validation
-		if config.row_to_block_field and config.row_to_block_field in block_data:
-			row_field_meta = block_meta.get_field(config.row_to_block_field)
-			if row_field_meta and row_field_meta.fieldtype == "Link":
-				# Validate that the row exists
-				row_value = block_data[config.row_to_block_field]
-				if row_value and not frappe.db.exists(row_field_meta.options, row_value):
-					frappe.throw(_(f"Invalid {row_field_meta.label}: {row_value} does not exist in {row_field_meta.options}"))
-		
-		# Process date fields based on their types
-		date_fields = [config.block_to_date_field, config.date_range_end_field]
-		for field_name in date_fields:
-			if field_name and field_name in block_data:
-				field_meta = block_meta.get_field(field_name)
-				if field_meta:
-					if field_meta.fieldtype == "Date":
-						# Convert to date only
-						if isinstance(block_data[field_name], str):
-							block_data[field_name] = getdate(block_data[field_name])
-					elif field_meta.fieldtype == "Datetime":
-						# Convert to datetime
-						if isinstance(block_data[field_name], str):
-							# If it's just a date string, add time
-							if len(block_data[field_name]) == 10:  # YYYY-MM-DD format
-								block_data[field_name] = block_data[field_name] + " 00:00:00"
-							block_data[field_name] = frappe.utils.get_datetime(block_data[field_name])
-		
+
+		# Validate the row and convert date fields
+		prepare_block_data(config, block_data)
+
 		# Create the block document
 		block_doc = frappe.get_doc(block_data)
 		block_doc.insert(ignore_permissions=True)
+		record_block_change(config, block_doc, "create")
 		frappe.db.commit()
 		
 		return {
@@ -504,49 +1032,144 @@ def create_dynamic_block(block_data, configuration_name):
 		}
 
 @frappe.whitelist()
-def get_configuration_field_metadata(configuration_name):
-	"""Get field metadata for a configuration to help with dynamic form creation"""
+@profile_endpoint
+def bulk_create_blocks(blocks, configuration_name, batch_size=500):
+	"""Create many blocks in one transaction
+
+	Each batch checks its row links with a single query; every block is inserted
+	under its own savepoint, so a failing block is reported in `results` without
+	undoing the others.
+	"""
 	try:
-		config = frappe.get_doc("Timeline Configuration", configuration_name)
+		blocks = frappe.parse_json(blocks) or []
+		batch_size = cint(batch_size) or 500
+
+		config = get_timeline_plan(configuration_name)
 		if not config.is_active:
 			frappe.throw(_("Timeline Configuration is not active"))
-		
-		# Get block meta
-		block_meta = frappe.get_meta(config.block_doctype)
-		
-		# Get field metadata for all relevant fields
-		field_metadata = {}
-		relevant_fields = [
-			config.block_to_date_field, 
-			config.date_range_end_field,
-			config.block_label_field,
-			config.block_description_field,
-			config.block_priority_field,
-			config.block_status_field,
-			config.block_duration_field,
-			config.block_color_field
-		]
-		
-		for field_name in relevant_fields:
-			if field_name:
-				field_meta = block_meta.get_field(field_name)
-				if field_meta:
-					field_metadata[field_name] = {
-						"fieldtype": field_meta.fieldtype,
-						"label": field_meta.label or field_name,
-						"options": field_meta.options,
-						"reqd": field_meta.reqd
-					}
-		
+
+		results = []
+		created_docs = []
+		for batch_start in range(0, len(blocks), batch_size):
+			batch = blocks[batch_start:batch_start + batch_size]
+			valid_rows = get_existing_rows(config, batch)
+
+			for index, block_data in enumerate(batch, start=batch_start):
+				savepoint = f"chronos_create_{index}"
+				frappe.db.savepoint(savepoint)
+
+				try:
+					block_data = dict(block_data, doctype=config.block_doctype)
+					prepare_block_data(config, block_data, valid_rows)
+
+					block_doc = frappe.get_doc(block_data)
+					block_doc.insert(ignore_permissions=True)
+					record_block_change(config, block_doc, "create")
+					created_docs.append(block_doc)
+					results.append({"index": index, "success": True, "name": block_doc.name})
+
+				except Exception as e:
+					frappe.db.rollback(save_point=savepoint)
+					results.append({"index": index, "success": False, "error": str(e)})
+
+		frappe.db.commit()
+
+		if created_docs:
+			emit_batch_update(created_docs)
+
 		return {
 			"success": True,
-			"field_metadata": field_metadata,
-			"config": config.as_dict()
+			"created": len(created_docs),
+			"failed": len(results) - len(created_docs),
+			"results": results
 		}
-		
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Bulk Create Blocks Error")
+		frappe.db.rollback()
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+def get_existing_rows(config, blocks):
+	"""Get the row links of `blocks` that exist, with one query; None when the row field is not a Link"""
+	if not config.row_link:
+		return None
+
+	row_values = list({block.get(config.row_to_block_field) for block in blocks} - {None, ""})
+	if not row_values:
+		return set()
+
+	return set(frappe.get_all(config.row_link["doctype"], filters={"name": ["in", row_values]}, pluck="name"))
+
+def prepare_block_data(config, block_data, valid_rows=None):
+	"""Validate the row link of new block data and convert its date fields in place
+
+	`valid_rows` are the row names known to exist, as from `get_existing_rows`;
+	without it the row is looked up on its own.
+	"""
+	row_link = config.row_link
+	row_value = block_data.get(config.row_to_block_field)
+	if row_link and row_value:
+		# Validate that the row exists
+		exists = row_value in valid_rows if valid_rows is not None else frappe.db.exists(row_link["doctype"], row_value)
+		if not exists:
+			frappe.throw(_(f"Invalid {row_link['label']}: {row_value} does not exist in {row_link['doctype']}"))
+
+	# Process date fields based on their types
+	for field_name, fieldtype in config.field_types.items():
+		if isinstance(block_data.get(field_name), str):
+			block_data[field_name] = convert_date_value(block_data[field_name], fieldtype)
+
+	return block_data
+
+@frappe.whitelist()
+@profile_endpoint
+def get_configuration_field_metadata(configuration_name, etag=None):
+	"""Get field metadata for a configuration to help with dynamic form creation
+
+	The response carries an `etag`. When the client sends it back (as `etag` or
+	in an `If-None-Match` header) and nothing changed, only
+	`{"success": True, "not_modified": True}` is returned.
+	"""
+	try:
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		if_none_match = etag or frappe.get_request_header("If-None-Match")
+		if if_none_match and if_none_match.removeprefix("W/").strip('"') == config.metadata_etag:
+			return {
+				"success": True,
+				"not_modified": True,
+				"etag": config.metadata_etag
+			}
+
+		return {
+			"success": True,
+			"field_metadata": config.field_metadata,
+			"config": config.config_dict,
+			"etag": config.metadata_etag
+		}
+
 	except Exception as e:
 		frappe.log_error(frappe.get_traceback(), "Get Configuration Field Metadata Error")
 		return {
 			"success": False,
 			"error": str(e)
 		}
+
+def convert_date_value(value, fieldtype):
+	"""Convert a date string from the client to the type of the target field"""
+	if fieldtype == "Date":
+		# Convert to date only
+		return getdate(value)
+
+	if fieldtype == "Datetime":
+		# If it's just a date string, add time
+		if len(value) == 10:  # YYYY-MM-DD format
+			value = value + " 00:00:00"
+		return frappe.utils.get_datetime(value)
+
+	return value
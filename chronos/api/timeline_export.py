@@ -0,0 +1,212 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint
+from werkzeug.wrappers import Response
+
+from chronos.api.timeline_data import format_block_records, get_row_filters
+from chronos.api.timeline_plan import get_timeline_plan
+
+# Records serialised per chunk written to the response
+CHUNK_SIZE = 1000
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+
+@frappe.whitelist()
+def export_timeline_data(configuration_name, start_date=None, end_date=None, filters=None):
+	"""Stream the rows and blocks of a window as NDJSON
+
+	The first line is `{"type": "meta", ...}`, followed by one `{"type": "row"}`
+	line per row and one `{"type": "block"}` line per block, in the same shape as
+	`get_timeline_data`. Blocks are read through an unbuffered cursor and written
+	in chunks, so memory stays flat whatever the size of the window.
+	"""
+	config = get_timeline_plan(configuration_name)
+	if not config.is_active:
+		frappe.throw(_("Timeline Configuration is not active"))
+
+	filters = frappe.parse_json(filters) or {}
+	if not start_date:
+		start_date = frappe.utils.nowdate()
+	if not end_date:
+		end_date = add_days(start_date, 30)
+
+	# Build the queries while the request is set up. Like get_timeline_data, get_all
+	# adds no permission conditions: the export returns what the board shows
+	row_query = frappe.get_all(
+		config.row_doctype,
+		filters=get_row_filters(filters),
+		fields=config.row_fields,
+		order_by=config.row_label_field,
+		run=0
+	)
+
+	block_filters = dict(filters.get("block_filters") or {})
+	block_filters.update(config.get_date_filters(start_date, end_date))
+	block_query = frappe.get_all(
+		config.block_doctype,
+		filters=block_filters,
+		fields=config.block_fields,
+		order_by=config.block_order_by,
+		run=0
+	)
+
+	meta = {
+		"type": "meta",
+		"config": config.config_payload,
+		"date_range": {"start_date": str(start_date), "end_date": str(end_date)}
+	}
+
+	response = Response(
+		stream_timeline_data(frappe.local.site, configuration_name, meta, row_query, block_query),
+		mimetype="application/x-ndjson",
+		direct_passthrough=True
+	)
+	response.headers["Content-Disposition"] = f'attachment; filename="{configuration_name}.ndjson"'
+	response.headers["X-Accel-Buffering"] = "no"
+
+	return response
+
+
+def stream_timeline_data(site, configuration_name, meta, row_query, block_query):
+	"""Yield NDJSON chunks; runs after the request has been torn down, so it opens its own connection"""
+	frappe.init(site=site)
+	frappe.connect()
+
+	try:
+		config = get_timeline_plan(configuration_name)
+		yield dump_line(meta)
+
+		with frappe.db.unbuffered_cursor():
+			rows = frappe.db.sql(row_query, as_dict=True, as_iterator=True)
+			yield from iter_chunks("row", config.format_row, rows)
+
+		with frappe.db.unbuffered_cursor():
+			blocks = frappe.db.sql(block_query, as_iterator=True)
+			yield from iter_chunks("block", config.format_block, blocks)
+
+	finally:
+		frappe.destroy()
+
+
+def iter_chunks(record_type, formatter, records):
+	"""Format records as NDJSON lines and join them into chunks of `CHUNK_SIZE`"""
+	lines = []
+	for record in records:
+		lines.append(dump_line({"type": record_type, **formatter(record)}))
+		if len(lines) >= CHUNK_SIZE:
+			yield "".join(lines)
+			lines = []
+
+	if lines:
+		yield "".join(lines)
+
+
+def dump_line(value):
+	return json.dumps(value, default=str, separators=(",", ":")) + "\n"
+
+
+@frappe.whitelist()
+def get_block_page(configuration_name, start_date=None, end_date=None, filters=None, cursor=None, page_size=None,
+		format=None):
+	"""Get one page of blocks ordered by start and name, and the cursor of the next page
+
+	Pass the returned `next_cursor` back as `cursor` until it is None. Pages are
+	selected by the last start/name seen instead of an OFFSET, so every page
+	costs the same however deep the walk goes. Both dates are optional.
+	"""
+	try:
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		page_size = min(cint(page_size) or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+		records, next_cursor = get_block_records_page(
+			config, start_date, end_date, frappe.parse_json(filters) or {}, cursor, page_size
+		)
+
+		return {
+			"success": True,
+			"blocks": format_block_records(config, records, format),
+			"next_cursor": next_cursor
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Get Block Page Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def iter_blocks(configuration_name, start_date=None, end_date=None, filters=None, cursor=None,
+		page_size=DEFAULT_PAGE_SIZE):
+	"""Yield every block of a configuration as a value tuple in `block_fields` order, one page at a time
+
+	For background jobs walking large ranges: memory holds one page, and the
+	walk can be resumed from any `cursor` handed out by `get_block_page`.
+	"""
+	config = get_timeline_plan(configuration_name)
+	while True:
+		records, cursor = get_block_records_page(config, start_date, end_date, filters, cursor, page_size)
+		yield from records
+		if not cursor:
+			break
+
+
+def get_block_records_page(config, start_date, end_date, filters, cursor, page_size):
+	"""Get up to `page_size` block records after `cursor` and the cursor following them"""
+	start_field = config.block_to_date_field
+	end_field = config.date_range_end_field or start_field
+
+	block_filters = [[start_field, "is", "set"]]
+	for field, value in ((filters or {}).get("block_filters") or {}).items():
+		block_filters.append([field, *value] if isinstance(value, (list, tuple)) else [field, "=", value])
+	if end_date:
+		block_filters.append([start_field, "<=", end_date])
+	if start_date:
+		block_filters.append([end_field, ">=", start_date])
+
+	# (start, name) > (last_start, last_name), as filters Frappe can express
+	or_filters = None
+	if cursor:
+		last_start, last_name = decode_cursor(cursor)
+		block_filters.append([start_field, ">=", last_start])
+		or_filters = [[start_field, ">", last_start], ["name", ">", last_name]]
+
+	records = frappe.get_all(
+		config.block_doctype,
+		filters=block_filters,
+		or_filters=or_filters,
+		fields=config.block_fields,
+		order_by=f"{start_field} asc, name asc",
+		limit_page_length=page_size,
+		as_list=True
+	)
+
+	next_cursor = None
+	if len(records) == page_size:
+		last = records[-1]
+		next_cursor = encode_cursor(last[config.block_fields.index(start_field)], last[0])
+
+	return records, next_cursor
+
+
+def encode_cursor(last_start, last_name):
+	return base64.urlsafe_b64encode(json.dumps([str(last_start), last_name]).encode()).decode()
+
+
+def decode_cursor(cursor):
+	try:
+		last_start, last_name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+	except Exception:
+		frappe.throw(_("Invalid cursor"))
+
+	return last_start, last_name
@@ -0,0 +1,181 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+import math
+
+from frappe.utils import flt, get_datetime, getdate
+
+from chronos.api.timeline_plan import format_datetime
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def to_datetime(value):
+	"""Normalise a date, datetime or date string to a naive datetime"""
+	if value is None or value.__class__ is datetime.datetime:
+		return value
+	if value.__class__ is datetime.date:
+		return datetime.datetime.combine(value, datetime.time())
+	return get_datetime(value)
+
+
+def is_end_inclusive(config):
+	"""Date-only blocks occupy their whole end day, datetime blocks end at their end time"""
+	end_field = config.date_range_end_field or config.block_to_date_field
+	return config.field_types.get(end_field) == "Date"
+
+
+def iter_block_spans(config, records):
+	"""Yield `(row, start, end, values)` for every placed block record, with `end` exclusive"""
+	column = {field: index for index, field in enumerate(config.block_fields)}
+	row_index = column[config.row_to_block_field]
+	start_index = column[config.block_to_date_field]
+	end_index = column.get(config.date_range_end_field)
+	end_padding = ONE_DAY if is_end_inclusive(config) else None
+
+	for values in records:
+		row = values[row_index]
+		start = to_datetime(values[start_index])
+		if not row or not start:
+			continue
+
+		end = to_datetime(values[end_index]) if end_index is not None else None
+		if not end or end < start:
+			end = start
+		if end_padding:
+			end = end + end_padding
+
+		yield row, start, end, values
+
+
+def get_block_intervals(config, records):
+	"""Get `(row, start, end, name)` for every placed block record, with `end` exclusive"""
+	name_index = config.block_fields.index("name")
+	return [(row, start, end, values[name_index]) for row, start, end, values in iter_block_spans(config, records)]
+
+
+def group_intervals_by_row(intervals):
+	"""Group `(row, start, end, name)` intervals per row, each row sorted by start then end"""
+	by_row = {}
+	for row, start, end, name in intervals:
+		by_row.setdefault(row, []).append((start, end, name))
+
+	for row_intervals in by_row.values():
+		row_intervals.sort()
+
+	return by_row
+
+
+def find_overlaps(config, records):
+	"""Find double-booked rows in O(n log n)
+
+	Blocks are sorted per row and swept once; each run of transitively
+	overlapping blocks is reported as one conflict with its combined span.
+	"""
+	conflicts = []
+	for row, intervals in group_intervals_by_row(get_block_intervals(config, records)).items():
+		cluster = None
+		cluster_end = None
+		previous_start = None
+
+		for start, end, name in intervals:
+			# Zero-length blocks only clash when they start at the same time
+			if cluster and (start < cluster_end or start == previous_start):
+				cluster["blocks"].append(name)
+				cluster_end = max(cluster_end, end)
+			else:
+				add_conflict(conflicts, row, cluster, cluster_end)
+				cluster = {"start": start, "blocks": [name]}
+				cluster_end = end
+			previous_start = start
+
+		add_conflict(conflicts, row, cluster, cluster_end)
+
+	return conflicts
+
+
+def add_conflict(conflicts, row, cluster, cluster_end):
+	if cluster and len(cluster["blocks"]) > 1:
+		conflicts.append({
+			"row_id": row,
+			"blocks": cluster["blocks"],
+			"start": format_datetime(cluster["start"]),
+			"end": format_datetime(cluster_end)
+		})
+
+
+def aggregate_utilisation(config, records, row_names, start_date, end_date, bucket="day"):
+	"""Sum the load of each row per day or week bucket
+
+	A block's load is its duration field when configured, otherwise its span in
+	hours; it is spread over the buckets it covers in proportion to the overlap.
+	Every block only touches the buckets it spans, so the cost is linear in the
+	number of blocks for typical boards.
+	"""
+	bucket_size = ONE_DAY if bucket == "day" else 7 * ONE_DAY
+	origin = to_datetime(getdate(start_date))
+	if bucket == "week":
+		origin -= origin.weekday() * ONE_DAY
+	window_end = to_datetime(getdate(end_date)) + ONE_DAY
+	bucket_count = max(1, math.ceil((window_end - origin) / bucket_size))
+
+	row_lookup = {name: index for index, name in enumerate(row_names)}
+	matrix = [[0.0] * bucket_count for _ in row_names]
+	duration_index = config.block_fields.index(config.block_duration_field) if config.block_duration_field else None
+
+	for row, start, end, values in iter_block_spans(config, records):
+		row_index = row_lookup.get(row)
+		if row_index is None:
+			continue
+
+		span = (end - start).total_seconds()
+		load = flt(values[duration_index]) if duration_index is not None else span / 3600
+		if not load:
+			continue
+
+		loads = matrix[row_index]
+		first = (start - origin) // bucket_size
+		if span <= 0:
+			if 0 <= first < bucket_count:
+				loads[first] += load
+			continue
+
+		last = min(bucket_count - 1, math.ceil((end - origin) / bucket_size) - 1)
+		for bucket_index in range(max(first, 0), last + 1):
+			bucket_start = origin + bucket_index * bucket_size
+			overlap = min(end, bucket_start + bucket_size) - max(start, bucket_start)
+			loads[bucket_index] += load * overlap.total_seconds() / span
+
+	return {
+		"bucket": bucket,
+		"unit": config.block_duration_field or "hours",
+		"buckets": [(origin + index * bucket_size).date().isoformat() for index in range(bucket_count)],
+		"rows": list(row_names),
+		"matrix": [[round(load, 2) for load in loads] for loads in matrix]
+	}
+
+
+def get_ripple_shifts(config, records, pushed_until):
+	"""Get `(values, shift)` for the blocks that must move forward to clear `pushed_until`
+
+	`records` are the blocks after the moved one on the same row, sorted by
+	start. The push travels down the row in one pass and stops at the first
+	block that already starts after the previous one ends.
+	"""
+	shifts = []
+	cursor = pushed_until
+	whole_days = config.field_types.get(config.block_to_date_field) == "Date"
+	for row, start, end, values in iter_block_spans(config, records):
+		if start >= cursor:
+			break
+
+		shift = cursor - start
+		if whole_days:
+			# Date blocks move by whole days
+			shift = ONE_DAY * math.ceil(shift / ONE_DAY)
+
+		shifts.append((values, shift))
+		cursor = end + shift
+
+	return shifts
@@ -0,0 +1,215 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, get_datetime
+
+from chronos.api.change_log import get_tracked_values, record_block_change
+from chronos.api.timeline_plan import get_timeline_plan
+
+# Redis lists of journal entries per user, most recent first
+UNDO_KEY = "chronos_journal_undo:{0}"
+REDO_KEY = "chronos_journal_redo:{0}"
+MAX_ENTRIES = 50
+
+TRACKED_KEYS = ("row", "start", "end", "duration")
+# Change log actions written by undo/redo themselves, never journaled
+REPLAY_ACTIONS = ("undo", "redo")
+
+
+def record_journal_entry(entries):
+	"""Journal the change log entries of one committed transaction as one undoable operation
+
+	Each op is `[configuration, block_doctype, block_name, action, old, new]`,
+	with old/new as `[row, start, end, duration]`.
+	"""
+	ops = [
+		[
+			entry["configuration"],
+			entry["block_doctype"],
+			entry["block_name"],
+			entry["action"],
+			[entry[f"old_{key}"] for key in TRACKED_KEYS],
+			[entry[f"new_{key}"] for key in TRACKED_KEYS]
+		]
+		for entry in entries if entry["action"] not in REPLAY_ACTIONS
+	]
+	if not ops:
+		return
+
+	user = entries[0]["user"]
+	entry = {"id": frappe.generate_hash(length=10), "timestamp": entries[0]["timestamp"], "ops": ops}
+
+	# A new operation starts a new history: it can no longer be redone past
+	cache = frappe.cache()
+	pipeline = cache.pipeline()
+	pipeline.lpush(cache.make_key(UNDO_KEY.format(user)), json.dumps(entry))
+	pipeline.ltrim(cache.make_key(UNDO_KEY.format(user)), 0, MAX_ENTRIES - 1)
+	pipeline.delete(cache.make_key(REDO_KEY.format(user)))
+	pipeline.execute()
+
+
+@frappe.whitelist()
+def undo(n=1):
+	"""Revert the user's last `n` operations in one transaction"""
+	return replay_journal(UNDO_KEY, REDO_KEY, "undo", cint(n) or 1)
+
+
+@frappe.whitelist()
+def redo(n=1):
+	"""Reapply the user's last `n` undone operations in one transaction"""
+	return replay_journal(REDO_KEY, UNDO_KEY, "redo", cint(n) or 1)
+
+
+@frappe.whitelist()
+def get_journal():
+	"""Get a summary of the operations the user can undo and redo, most recent first"""
+	try:
+		return {
+			"success": True,
+			"undo": [summarise_entry(entry) for entry in get_entries(UNDO_KEY, MAX_ENTRIES)],
+			"redo": [summarise_entry(entry) for entry in get_entries(REDO_KEY, MAX_ENTRIES)]
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Get Timeline Journal Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def replay_journal(source_key, target_key, direction, n):
+	"""Apply the first `n` entries of one journal list and move them to the other one
+
+	Blocks changed by someone else since the entry was recorded are skipped and
+	reported in `conflicts`; everything else is written in one transaction.
+	"""
+	try:
+		entries = get_entries(source_key, n)
+		if not entries:
+			return {"success": True, "applied": 0, "conflicts": []}
+
+		conflicts = []
+		for entry in entries:
+			for op in reversed(entry["ops"]) if direction == "undo" else entry["ops"]:
+				conflict = apply_op(op, direction)
+				if conflict:
+					conflicts.append(conflict)
+
+		frappe.db.commit()
+
+		user = frappe.session.user
+		cache = frappe.cache()
+		pipeline = cache.pipeline()
+		pipeline.ltrim(cache.make_key(source_key.format(user)), len(entries), -1)
+		for entry in entries:
+			pipeline.lpush(cache.make_key(target_key.format(user)), json.dumps(entry))
+		pipeline.ltrim(cache.make_key(target_key.format(user)), 0, MAX_ENTRIES - 1)
+		pipeline.execute()
+
+		return {
+			"success": True,
+			"applied": len(entries),
+			"conflicts": conflicts
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Timeline Journal Error")
+		frappe.db.rollback()
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def apply_op(op, direction):
+	"""Apply one journaled op forwards (redo) or backwards (undo); returns a conflict or None"""
+	configuration_name, block_doctype, block_name, action, old, new = op
+	config = get_timeline_plan(configuration_name)
+	expected, target = (new, old) if direction == "undo" else (old, new)
+
+	if action == "create":
+		if direction == "undo":
+			if not frappe.db.exists(block_doctype, block_name):
+				return None
+			# Keep the block if someone moved or resized it since it was created
+			block_doc = frappe.get_doc(block_doctype, block_name, for_update=True)
+			if not values_match(get_tracked_values(config, block_doc), expected):
+				return {"block_name": block_name, "action": action, "reason": _("Changed since the operation")}
+			frappe.delete_doc(block_doctype, block_name, ignore_permissions=True)
+		else:
+			restore_block(block_doctype, block_name)
+		return None
+
+	block_doc = frappe.get_doc(block_doctype, block_name, for_update=True)
+	current = get_tracked_values(config, block_doc)
+	if not values_match(current, expected):
+		return {"block_name": block_name, "action": action, "reason": _("Changed since the operation")}
+
+	for field, value in zip(get_tracked_fields(config), target):
+		if field:
+			block_doc.set(field, value)
+
+	block_doc.save(ignore_permissions=True)
+	record_block_change(config, block_doc, direction, current)
+	return None
+
+
+def restore_block(block_doctype, block_name):
+	"""Bring back a block deleted by undoing its creation"""
+	from frappe.core.doctype.deleted_document.deleted_document import restore
+
+	deleted = frappe.get_all(
+		"Deleted Document",
+		filters={"deleted_doctype": block_doctype, "deleted_name": block_name, "restored": 0},
+		order_by="creation desc",
+		limit_page_length=1,
+		pluck="name"
+	)
+	if deleted:
+		restore(deleted[0], alert=False)
+
+
+def get_tracked_fields(config):
+	"""Fields of the row, start, end and duration tracked in the change log"""
+	return (
+		config.row_to_block_field,
+		config.block_to_date_field,
+		config.date_range_end_field,
+		config.block_duration_field
+	)
+
+
+def values_match(current, recorded):
+	"""Compare the tracked values of a block with the journaled ones, which went through JSON"""
+	row, start, end, duration = recorded
+	return (
+		(current["row"] or None) == (row or None)
+		and same_datetime(current["start"], start)
+		and same_datetime(current["end"], end)
+		and flt(current["duration"]) == flt(duration)
+	)
+
+
+def same_datetime(value, recorded):
+	if not value or not recorded:
+		return not value and not recorded
+	return get_datetime(value) == get_datetime(recorded)
+
+
+def get_entries(key, count):
+	return [json.loads(entry) for entry in frappe.cache().lrange(key.format(frappe.session.user), 0, count - 1)]
+
+
+def summarise_entry(entry):
+	actions = sorted({op[3] for op in entry["ops"]})
+	return {
+		"id": entry["id"],
+		"timestamp": entry["timestamp"],
+		"blocks": len(entry["ops"]),
+		"actions": actions
+	}
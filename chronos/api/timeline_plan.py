@@ -0,0 +1,477 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+import hashlib
+import json
+
+import frappe
+
+# Redis hash holding one compiled plan spec per Timeline Configuration
+PLAN_CACHE_KEY = "chronos_timeline_plan"
+# Block doctype -> names of the active configurations showing it
+BLOCK_DOCTYPES_CACHE_KEY = "chronos_timeline_block_doctypes"
+# Row doctype -> names of the active configurations showing it
+ROW_DOCTYPES_CACHE_KEY = "chronos_timeline_row_doctypes"
+
+
+# Mapping fields copied from the Timeline Configuration into the plan
+CONFIG_FIELDS = [
+	"row_to_block_field",
+	"block_to_date_field",
+	"row_label_field",
+	"block_label_field",
+	"block_color_field",
+	"date_range_start_field",
+	"date_range_end_field",
+	"block_duration_field",
+	"block_status_field",
+	"block_priority_field",
+	"block_description_field"
+]
+
+ROW_ADDITIONAL_FIELDS = ["status", "department", "company", "disabled"]
+BLOCK_ADDITIONAL_FIELDS = ["status", "priority", "progress", "description", "owner", "creation", "modified"]
+BLOCK_PASSTHROUGH_FIELDS = ["progress", "description", "owner", "creation", "modified"]
+
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_DATE = EPOCH.date()
+ONE_SECOND = datetime.timedelta(seconds=1)
+
+# In-process compiled plans, keyed on (site, configuration name)
+_plans = {}
+
+
+class TimelinePlan:
+	"""Immutable, precompiled view of a Timeline Configuration
+
+	Holds everything the timeline endpoints used to rebuild on each request:
+	field lists, the date filter shape, field types and the row/block formatters.
+	Unknown attributes resolve to None, like `Document.get`.
+	"""
+
+	def __init__(self, spec):
+		object.__setattr__(self, "_spec", spec)
+		object.__setattr__(self, "format_row", build_row_formatter(spec))
+		object.__setattr__(self, "format_block", build_block_formatter(spec))
+		object.__setattr__(self, "encode_blocks", build_block_encoder(spec))
+
+	def __getattr__(self, key):
+		if key.startswith("__"):
+			raise AttributeError(key)
+		return self._spec.get(key)
+
+	def __setattr__(self, key, value):
+		raise AttributeError("TimelinePlan is immutable")
+
+	def get(self, key, default=None):
+		return self._spec.get(key, default)
+
+	def get_date_filters(self, start_date, end_date):
+		"""Get the block filters selecting the window between `start_date` and `end_date`"""
+		if self.date_range_end_field:
+			# block_to_date_field is start, date_range_end_field is end
+			return {
+				self.block_to_date_field: ["<=", end_date],
+				self.date_range_end_field: [">=", start_date]
+			}
+
+		return {self.block_to_date_field: ["between", [start_date, end_date]]}
+
+
+def get_timeline_plan(configuration_name):
+	"""Get the compiled plan for a Timeline Configuration, compiling it on first use"""
+	spec = frappe.cache().hget(
+		PLAN_CACHE_KEY,
+		configuration_name,
+		generator=lambda: compile_plan_spec(configuration_name)
+	)
+
+	key = (frappe.local.site, configuration_name)
+	plan = _plans.get(key)
+	if not plan or plan.version != spec["version"]:
+		plan = TimelinePlan(spec)
+		_plans[key] = plan
+
+	return plan
+
+
+def clear_timeline_plan(configuration_name=None):
+	"""Drop the cached plan of one configuration, or of all of them"""
+	if configuration_name:
+		frappe.cache().hdel(PLAN_CACHE_KEY, configuration_name)
+	else:
+		frappe.cache().delete_value(PLAN_CACHE_KEY)
+
+	frappe.cache().delete_value([BLOCK_DOCTYPES_CACHE_KEY, ROW_DOCTYPES_CACHE_KEY])
+
+
+def clear_timeline_plan_on_commit(configuration_name=None):
+	"""Drop the cached plan now and again once the transaction commits
+
+	A request compiling the plan in between reads the old committed
+	configuration, and would keep that plan cached until the next change.
+	"""
+	clear_timeline_plan(configuration_name)
+
+	pending = frappe.local.flags.setdefault("chronos_cleared_plans", set())
+	if not pending:
+		frappe.db.after_commit.add(clear_pending_plans)
+		frappe.db.after_rollback.add(discard_pending_plans)
+	pending.add(configuration_name)
+
+
+def clear_pending_plans():
+	"""Drop the plans changed in this transaction; None stands for all of them"""
+	pending = frappe.local.flags.pop("chronos_cleared_plans", None) or ()
+	if None in pending:
+		clear_timeline_plan()
+		return
+
+	for configuration_name in pending:
+		clear_timeline_plan(configuration_name)
+
+
+def discard_pending_plans():
+	frappe.local.flags.pop("chronos_cleared_plans", None)
+
+
+def clear_timeline_plans(doc=None, method=None):
+	"""doc_events hook: DocType, Custom Field and Property Setter changes can change mapped fields
+	and their types, so recompile every plan"""
+	clear_timeline_plan_on_commit()
+
+
+def get_block_doctype_configurations():
+	"""Get the active configurations per block doctype, e.g. `{"Work Order": ["Job Card Planning"]}`"""
+	return frappe.cache().get_value(BLOCK_DOCTYPES_CACHE_KEY, generator=build_block_doctype_configurations)
+
+
+def get_row_doctype_configurations():
+	"""Get the active configurations per row doctype, e.g. `{"Workstation": ["Job Card Planning"]}`"""
+	return frappe.cache().get_value(ROW_DOCTYPES_CACHE_KEY, generator=build_row_doctype_configurations)
+
+
+def build_block_doctype_configurations():
+	return build_doctype_configurations("block_doctype")
+
+
+def build_row_doctype_configurations():
+	return build_doctype_configurations("row_doctype")
+
+
+def build_doctype_configurations(doctype_field):
+	configurations = {}
+	for config in frappe.get_all(
+		"Timeline Configuration",
+		filters={"is_active": 1},
+		fields=["name", doctype_field]
+	):
+		configurations.setdefault(config.get(doctype_field), []).append(config.name)
+
+	return configurations
+
+
+def compile_plan_spec(configuration_name):
+	"""Build the picklable part of a plan from the configuration and DocType meta"""
+	config = frappe.get_doc("Timeline Configuration", configuration_name)
+	row_meta = frappe.get_meta(config.row_doctype)
+	block_meta = frappe.get_meta(config.block_doctype)
+
+	spec = {
+		"version": frappe.generate_hash(length=10),
+		"name": config.name,
+		"modified": str(config.modified),
+		"configuration_name": config.configuration_name,
+		"description": config.description,
+		"is_active": config.is_active,
+		"row_doctype": config.row_doctype,
+		"block_doctype": config.block_doctype
+	}
+	for field in CONFIG_FIELDS:
+		spec[field] = config.get(field)
+
+	# Row field list
+	row_fields = ["name", config.row_label_field]
+	for field in ROW_ADDITIONAL_FIELDS:
+		if row_meta.get_field(field):
+			row_fields.append(field)
+	spec["row_fields"] = unique(row_fields)
+
+	# Block field list
+	block_fields = [
+		"name",
+		config.row_to_block_field,
+		config.block_to_date_field,
+		config.block_label_field,
+		config.block_color_field,
+		config.date_range_end_field,
+		config.block_duration_field,
+		config.block_status_field,
+		config.block_priority_field
+	]
+	for field in BLOCK_ADDITIONAL_FIELDS:
+		if block_meta.get_field(field):
+			block_fields.append(field)
+	# Standard field, not in meta.fields; read for the version token of every block
+	block_fields.append("modified")
+	spec["block_fields"] = unique(block_fields)
+	spec["block_passthrough_fields"] = [f for f in BLOCK_PASSTHROUGH_FIELDS if f in spec["block_fields"]]
+	spec["block_order_by"] = f"{config.block_to_date_field} asc"
+
+	# Field types used when converting incoming values
+	spec["field_types"] = {}
+	for field in (config.block_to_date_field, config.date_range_end_field):
+		field_meta = block_meta.get_field(field) if field else None
+		if field_meta:
+			spec["field_types"][field] = field_meta.fieldtype
+
+	row_field_meta = block_meta.get_field(config.row_to_block_field)
+	spec["row_link"] = None
+	if row_field_meta and row_field_meta.fieldtype == "Link":
+		spec["row_link"] = {"doctype": row_field_meta.options, "label": row_field_meta.label}
+
+	# Field metadata served to the block creation form
+	spec["field_metadata"] = {}
+	for field in (
+		config.block_to_date_field,
+		config.date_range_end_field,
+		config.block_label_field,
+		config.get("block_description_field"),
+		config.block_priority_field,
+		config.block_status_field,
+		config.block_duration_field,
+		config.block_color_field
+	):
+		field_meta = block_meta.get_field(field) if field else None
+		if field_meta:
+			spec["field_metadata"][field] = {
+				"fieldtype": field_meta.fieldtype,
+				"label": field_meta.label or field,
+				"options": field_meta.options,
+				"reqd": field_meta.reqd
+			}
+
+	spec["config_dict"] = config.as_dict()
+
+	# Content hash of the metadata response, used as its ETag
+	spec["metadata_etag"] = hashlib.sha1(
+		json.dumps([spec["field_metadata"], spec["config_dict"]], sort_keys=True, default=str).encode()
+	).hexdigest()
+
+	spec["config_payload"] = {
+		"name": config.name,
+		"configuration_name": config.configuration_name,
+		"description": config.description,
+		"row_doctype": config.row_doctype,
+		"block_doctype": config.block_doctype,
+		"block_to_date_field": config.block_to_date_field,
+		"date_range_end_field": config.date_range_end_field,
+		"block_duration_field": config.block_duration_field,
+		"block_status_field": config.block_status_field,
+		"block_priority_field": config.block_priority_field,
+		"field_mappings": {
+			"row_to_block_field": config.row_to_block_field,
+			"block_to_date_field": config.block_to_date_field,
+			"row_label_field": config.row_label_field,
+			"block_label_field": config.block_label_field,
+			"block_color_field": config.block_color_field,
+			"date_range_end_field": config.date_range_end_field,
+			"block_duration_field": config.block_duration_field,
+			"block_status_field": config.block_status_field,
+			"block_priority_field": config.block_priority_field
+		}
+	}
+
+	return spec
+
+
+def build_row_formatter(spec):
+	"""Build the closure turning a row record into its timeline payload"""
+	doctype = spec["row_doctype"]
+	label_field = spec["row_label_field"]
+	extra_fields = [f for f in spec["row_fields"] if f not in ("name", label_field)]
+
+	def format_row(row):
+		name = row.name
+		formatted_row = {
+			"id": name,
+			"name": name,
+			"label": row.get(label_field) or name,
+			"doctype": doctype
+		}
+		for field in extra_fields:
+			formatted_row[field] = row.get(field)
+
+		return formatted_row
+
+	return format_row
+
+
+def build_block_formatter(spec):
+	"""Build the closure turning a block record into its timeline payload
+
+	Records are value tuples in `block_fields` order, as returned by
+	`frappe.get_all(..., as_list=True)`; every field lookup is resolved to a
+	column index here, once per plan, instead of once per block.
+	"""
+	doctype = spec["block_doctype"]
+	column = {field: index for index, field in enumerate(spec["block_fields"])}
+
+	name_index = column["name"]
+	label_index = column[spec["block_label_field"]]
+	row_index = column[spec["row_to_block_field"]]
+	start_index = column[spec["block_to_date_field"]]
+	end_index = column.get(spec["date_range_end_field"])
+	duration_index = column.get(spec["block_duration_field"])
+	version_index = column["modified"]
+	value_columns = [
+		(key, column[field]) for key, field in (
+			("status", spec["block_status_field"]),
+			("priority", spec["block_priority_field"]),
+			("color", spec["block_color_field"])
+		) if field
+	] + [(field, column[field]) for field in spec["block_passthrough_fields"]]
+
+	def format_block(values):
+		name = values[name_index]
+		start = format_datetime(values[start_index])
+		formatted_block = {
+			"id": name,
+			"name": name,
+			"label": values[label_index] or name,
+			"doctype": doctype,
+			"row_id": values[row_index],
+			"date": start,
+			"version": to_version(values[version_index])
+		}
+
+		# Add date range if available (block_to_date_field is start, date_range_end_field is end)
+		if end_index is not None:
+			if start:
+				formatted_block["start_date"] = start
+			end = values[end_index]
+			if end:
+				formatted_block["end_date"] = format_datetime(end)
+
+		if duration_index is not None:
+			formatted_block["duration"] = values[duration_index] or 0
+
+		for key, index in value_columns:
+			formatted_block[key] = values[index]
+
+		return formatted_block
+
+	return format_block
+
+
+def build_block_encoder(spec):
+	"""Build the closure encoding block records as a columnar payload
+
+	The payload carries a schema plus one array per column: `id` replaces
+	`id`/`name`, the doctype is sent once, `row_index` points into `row_ids`
+	and dates are epoch seconds of the naive server wall-clock time.
+	"""
+	doctype = spec["block_doctype"]
+	column = {field: index for index, field in enumerate(spec["block_fields"])}
+	has_date_range = bool(spec["date_range_end_field"])
+
+	# (key, record index, kind)
+	column_specs = [
+		("id", column["name"], "value"),
+		("label", column[spec["block_label_field"]], "value"),
+		("row_index", column[spec["row_to_block_field"]], "row"),
+		("date", column[spec["block_to_date_field"]], "epoch"),
+		("version", column["modified"], "version")
+	]
+	if has_date_range:
+		column_specs.append(("end_date", column[spec["date_range_end_field"]], "epoch"))
+	if spec["block_duration_field"]:
+		column_specs.append(("duration", column[spec["block_duration_field"]], "value"))
+	for key, field in (
+		("status", spec["block_status_field"]),
+		("priority", spec["block_priority_field"]),
+		("color", spec["block_color_field"])
+	):
+		if field:
+			column_specs.append((key, column[field], "value"))
+	for field in spec["block_passthrough_fields"]:
+		column_specs.append((field, column[field], "epoch" if field in ("creation", "modified") else "value"))
+
+	schema = [key for key, index, kind in column_specs]
+	epoch_columns = [key for key, index, kind in column_specs if kind == "epoch"]
+
+	def encode_blocks(records, row_ids=()):
+		# Seed the dictionary with the board rows so indexes line up with `rows`
+		row_ids = list(row_ids)
+		row_lookup = {row_id: index for index, row_id in enumerate(row_ids)}
+
+		def encode_row(row_id):
+			if row_id is None:
+				return None
+			index = row_lookup.get(row_id)
+			if index is None:
+				index = row_lookup[row_id] = len(row_ids)
+				row_ids.append(row_id)
+			return index
+
+		columns = []
+		for key, index, kind in column_specs:
+			if kind == "epoch":
+				columns.append([to_epoch(values[index]) for values in records])
+			elif kind == "row":
+				columns.append([encode_row(values[index]) for values in records])
+			elif kind == "version":
+				columns.append([to_version(values[index]) for values in records])
+			else:
+				columns.append([values[index] for values in records])
+
+		return {
+			"format": "columnar",
+			"doctype": doctype,
+			"count": len(records),
+			"date_range": has_date_range,
+			"schema": schema,
+			"epoch_columns": epoch_columns,
+			"row_ids": row_ids,
+			"columns": columns
+		}
+
+	return encode_blocks
+
+
+def get_block_values(config, doc):
+	"""Get the value tuple of a loaded block document, in `block_fields` order"""
+	return tuple(doc.get(field) for field in config.block_fields)
+
+
+def format_datetime(value):
+	"""Format dates and datetimes as `YYYY-MM-DD HH:MM:SS` for the frontend, pass anything else through"""
+	value_type = value.__class__
+	if value_type is datetime.datetime:
+		return value.isoformat(" ", "seconds")
+	if value_type is datetime.date:
+		return value.isoformat() + " 00:00:00"
+	return value
+
+
+def to_version(modified):
+	"""Get the version token of a block from its `modified` value, stable across datetime and string forms"""
+	if modified.__class__ is not datetime.datetime:
+		modified = frappe.utils.get_datetime(modified)
+	return modified.isoformat(" ", "microseconds") if modified else None
+
+
+def to_epoch(value):
+	"""Convert dates and datetimes to epoch seconds of their wall-clock time, pass anything else through"""
+	value_type = value.__class__
+	if value_type is datetime.datetime:
+		return (value - EPOCH) // ONE_SECOND
+	if value_type is datetime.date:
+		return (value - EPOCH_DATE).days * 86400
+	return value
+
+
+def unique(fields):
+	"""Drop empty and duplicate field names, keeping the first occurrence"""
+	return list(dict.fromkeys(f for f in fields if f))
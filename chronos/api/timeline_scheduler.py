@@ -0,0 +1,266 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import bisect
+import datetime
+import math
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, getdate
+
+from chronos.api.change_log import get_tracked_values, record_block_change
+from chronos.api.timeline_data import convert_date_value, get_block_records, get_row_entities
+from chronos.api.timeline_intervals import ONE_DAY, group_intervals_by_row, get_block_intervals, to_datetime
+from chronos.api.timeline_plan import format_datetime, get_timeline_plan
+from chronos.realtime import emit_batch_update
+
+ONE_HOUR = datetime.timedelta(hours=1)
+
+# Rank of the usual Select priorities; numeric priorities rank by value
+PRIORITY_RANKS = {"urgent": 4, "high": 3, "medium": 2, "low": 1}
+
+
+@frappe.whitelist()
+def auto_schedule_blocks(configuration_name, start_date=None, end_date=None, block_names=None, row_ids=None,
+		filters=None, commit=0):
+	"""Place unassigned blocks on rows within a window
+
+	Blocks are taken in priority order (highest first, then longest first) and
+	each goes to the earliest free slot of any row, sized by the configured
+	duration field (hours) or the block's current span. Blocks already on the
+	board in the window are kept and treated as busy time.
+
+	Without `commit` only the preview diff is returned; with `commit` the same
+	placement is written in one transaction.
+	"""
+	try:
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		filters = frappe.parse_json(filters) or {}
+		block_names = frappe.parse_json(block_names) if block_names else None
+		row_ids = frappe.parse_json(row_ids) if row_ids else None
+
+		if not start_date:
+			start_date = frappe.utils.nowdate()
+		if not end_date:
+			end_date = add_days(start_date, 30)
+
+		row_names = [row["name"] for row in get_row_entities(config, filters)]
+		if row_ids:
+			allowed = set(row_ids)
+			row_names = [name for name in row_names if name in allowed]
+		if not row_names:
+			frappe.throw(_("No rows available to schedule on"))
+
+		placed = get_block_records(config, start_date, end_date, filters)
+		pending = get_unassigned_records(config, filters, block_names)
+
+		schedule = plan_schedule(config, pending, placed, row_names, start_date, end_date)
+
+		if cint(commit):
+			schedule["results"] = apply_schedule(config, schedule["assignments"])
+
+		return {
+			"success": True,
+			"committed": bool(cint(commit)),
+			**schedule
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Auto Schedule Blocks Error")
+		frappe.db.rollback()
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def get_unassigned_records(config, filters=None, block_names=None):
+	"""Get the blocks without a row as value tuples in `config.block_fields` order"""
+	block_filters = {}
+	if filters and filters.get("block_filters"):
+		block_filters.update(filters["block_filters"])
+
+	block_filters[config.row_to_block_field] = ["is", "not set"]
+	if block_names is not None:
+		block_filters["name"] = ["in", block_names]
+
+	return frappe.get_all(
+		config.block_doctype,
+		filters=block_filters,
+		fields=config.block_fields,
+		order_by=config.block_order_by,
+		as_list=True
+	)
+
+
+def plan_schedule(config, pending, placed, row_names, start_date, end_date):
+	"""Compute the placement of `pending` blocks around the `placed` ones, without writing anything"""
+	window_start = to_datetime(getdate(start_date))
+	window_end = to_datetime(getdate(end_date)) + ONE_DAY
+	is_date_board = config.field_types.get(config.block_to_date_field) == "Date"
+
+	# Free gaps per row: sorted [start, end) pairs left around the busy blocks
+	busy = group_intervals_by_row(get_block_intervals(config, placed))
+	free_gaps = [get_free_gaps(busy.get(row, ()), window_start, window_end) for row in row_names]
+
+	# Rows ordered by the start of their first gap, so the search can stop early
+	row_order = sorted((gaps[0][0], index) for index, gaps in enumerate(free_gaps) if gaps)
+
+	column = {field: index for index, field in enumerate(config.block_fields)}
+	name_index = column["name"]
+	jobs = [(get_block_length(config, column, values, is_date_board), values) for values in pending]
+	jobs.sort(key=lambda job: (-get_priority_rank(config, column, job[1]), -job[0], job[1][name_index]))
+
+	assignments = []
+	unscheduled = []
+	for length, values in jobs:
+		best = None
+		for first_free, row_index in row_order:
+			if best and first_free >= best[0]:
+				break
+			fit = find_fit(free_gaps[row_index], length)
+			if fit is not None and (not best or fit < best[0]):
+				best = (fit, row_index)
+
+		if not best:
+			unscheduled.append({"block_name": values[name_index], "reason": _("No free slot in the window")})
+			continue
+
+		start, row_index = best
+		gaps = free_gaps[row_index]
+		old_first = gaps[0][0]
+		reserve_slot(gaps, start, length)
+
+		# Keep the row order in sync with the row's new first gap
+		del row_order[bisect.bisect_left(row_order, (old_first, row_index))]
+		if gaps:
+			bisect.insort(row_order, (gaps[0][0], row_index))
+
+		assignments.append(build_assignment(config, column, values, row_names[row_index], start, length, is_date_board))
+
+	return {
+		"assignments": assignments,
+		"unscheduled": unscheduled,
+		"scheduled": len(assignments)
+	}
+
+
+def get_free_gaps(intervals, window_start, window_end):
+	"""Get the free `[start, end)` gaps of a row in the window, given its sorted busy intervals"""
+	gaps = []
+	cursor = window_start
+	for start, end, name in intervals:
+		if start > cursor:
+			gaps.append([cursor, min(start, window_end)])
+		cursor = max(cursor, end)
+		if cursor >= window_end:
+			break
+
+	if cursor < window_end:
+		gaps.append([cursor, window_end])
+
+	return [gap for gap in gaps if gap[1] > gap[0]]
+
+
+def find_fit(gaps, length):
+	"""Get the start of the first gap that holds `length`, or None"""
+	for start, end in gaps:
+		if end - start >= length:
+			return start
+	return None
+
+
+def reserve_slot(gaps, start, length):
+	"""Take `[start, start + length)` out of the gap starting at `start`"""
+	index = bisect.bisect_left(gaps, [start])
+	gap = gaps[index]
+	gap[0] = start + length
+	if gap[0] >= gap[1]:
+		del gaps[index]
+
+
+def get_block_length(config, column, values, is_date_board):
+	"""Get the time a block occupies: its duration in hours, else its current span, else one slot"""
+	length = None
+	if config.block_duration_field and flt(values[column[config.block_duration_field]]) > 0:
+		length = datetime.timedelta(hours=flt(values[column[config.block_duration_field]]))
+	elif config.date_range_end_field:
+		start = to_datetime(values[column[config.block_to_date_field]])
+		end = to_datetime(values[column[config.date_range_end_field]])
+		if start and end and end >= start:
+			length = end - start + (ONE_DAY if is_date_board else datetime.timedelta())
+
+	if is_date_board:
+		return ONE_DAY * max(1, math.ceil((length or ONE_DAY) / ONE_DAY))
+
+	return length or ONE_HOUR
+
+
+def get_priority_rank(config, column, values):
+	"""Rank a block by its priority field, higher is scheduled first"""
+	if not config.block_priority_field:
+		return 0
+
+	priority = values[column[config.block_priority_field]]
+	if isinstance(priority, (int, float)):
+		return priority
+
+	return PRIORITY_RANKS.get(str(priority or "").lower(), 0)
+
+
+def build_assignment(config, column, values, row, start, length, is_date_board):
+	"""Describe one placement as a preview diff entry"""
+	end = start + length
+	if is_date_board:
+		start = start.date()
+		end = (end - ONE_DAY).date()
+
+	assignment = {
+		"block_name": values[column["name"]],
+		"row_id": row,
+		"start": format_datetime(start),
+		"old_start": format_datetime(values[column[config.block_to_date_field]])
+	}
+	if config.date_range_end_field:
+		assignment["end"] = format_datetime(end)
+		assignment["old_end"] = format_datetime(values[column[config.date_range_end_field]])
+
+	return assignment
+
+
+def apply_schedule(config, assignments):
+	"""Write the assignments in one transaction; a failing block is rolled back on its own"""
+	results = []
+	updated_docs = []
+	for index, assignment in enumerate(assignments):
+		savepoint = f"chronos_schedule_{index}"
+		frappe.db.savepoint(savepoint)
+
+		try:
+			block_doc = frappe.get_doc(config.block_doctype, assignment["block_name"])
+			old_values = get_tracked_values(config, block_doc)
+
+			block_doc.set(config.row_to_block_field, assignment["row_id"])
+			for field, key in ((config.block_to_date_field, "start"), (config.date_range_end_field, "end")):
+				if field:
+					block_doc.set(field, convert_date_value(assignment[key], config.field_types.get(field)))
+
+			block_doc.save(ignore_permissions=True)
+			record_block_change(config, block_doc, "schedule", old_values)
+			updated_docs.append(block_doc)
+			results.append({"block_name": assignment["block_name"], "success": True})
+
+		except Exception as e:
+			frappe.db.rollback(save_point=savepoint)
+			results.append({"block_name": assignment["block_name"], "success": False, "error": str(e)})
+
+	frappe.db.commit()
+
+	if updated_docs:
+		emit_batch_update(updated_docs)
+
+	return results
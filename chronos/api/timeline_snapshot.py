@@ -0,0 +1,227 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from chronos.api.timeline_cache import get_cached_result, get_generation, get_permission_scope
+from chronos.api.timeline_plan import get_timeline_plan
+
+# Redis hash of snapshot key -> where and when the snapshot was built
+SNAPSHOT_INDEX_KEY = "chronos_timeline_snapshots"
+SNAPSHOT_FOLDER = "chronos_snapshots"
+PAGE_SIZE = 5000
+# Snapshots older than this are not served at all (seconds)
+DEFAULT_MAX_AGE = 3600
+# Snapshot files are deleted this long after they were built (days)
+RETENTION_DAYS = 7
+
+
+@frappe.whitelist()
+def build_timeline_snapshot(configuration_name, start_date, end_date, filters=None, format=None):
+	"""Queue the materialisation of a long window; progress is published as `chronos_snapshot_progress`"""
+	try:
+		config = get_timeline_plan(configuration_name)
+		if not config.is_active:
+			frappe.throw(_("Timeline Configuration is not active"))
+
+		filters = frappe.parse_json(filters) or {}
+		snapshot_key = get_snapshot_key(config, start_date, end_date, filters, format)
+		enqueue_snapshot(configuration_name, start_date, end_date, filters, format, snapshot_key)
+
+		return {
+			"success": True,
+			"snapshot_key": snapshot_key
+		}
+
+	except Exception as e:
+		frappe.log_error(frappe.get_traceback(), "Build Timeline Snapshot Error")
+		return {
+			"success": False,
+			"error": str(e)
+		}
+
+
+def enqueue_snapshot(configuration_name, start_date, end_date, filters, format, snapshot_key):
+	frappe.enqueue(
+		"chronos.api.timeline_snapshot.materialise_snapshot",
+		queue="long",
+		timeout=3600,
+		job_id=f"chronos_snapshot:{snapshot_key}",
+		deduplicate=True,
+		configuration_name=configuration_name,
+		start_date=start_date,
+		end_date=end_date,
+		filters=filters,
+		format=format,
+		snapshot_key=snapshot_key
+	)
+
+
+def materialise_snapshot(configuration_name, start_date, end_date, filters, format, snapshot_key):
+	"""Background job: build the `get_timeline_data` response of a window page by page into a gzip file"""
+	# Imported here, timeline_data serves snapshots from this module
+	from chronos.api.timeline_data import format_block_records, get_row_entities, get_watermark
+	from chronos.api.timeline_export import get_block_records_page
+
+	config = get_timeline_plan(configuration_name)
+
+	# Capture the generation and watermark before reading, like get_timeline_data
+	generation = get_generation(config.name)
+	watermark = get_watermark()
+
+	rows = get_row_entities(config, filters)
+	block_filters = dict(filters.get("block_filters") or {})
+	block_filters.update(config.get_date_filters(start_date, end_date))
+	total = frappe.db.count(config.block_doctype, block_filters)
+
+	records = []
+	cursor = None
+	while True:
+		page, cursor = get_block_records_page(config, start_date, end_date, filters, cursor, PAGE_SIZE)
+		records.extend(page)
+		publish_progress(snapshot_key, configuration_name, len(records), total)
+		if not cursor:
+			break
+
+	result = {
+		"success": True,
+		"config": config.config_payload,
+		"rows": rows,
+		"blocks": format_block_records(config, records, format, [row["id"] for row in rows]),
+		"date_range": {
+			"start_date": start_date,
+			"end_date": end_date
+		},
+		"watermark": watermark
+	}
+
+	path = get_snapshot_path(snapshot_key)
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with gzip.open(f"{path}.tmp", "wt", compresslevel=6) as f:
+		json.dump(result, f, default=str, separators=(",", ":"))
+	os.replace(f"{path}.tmp", path)
+
+	frappe.cache().hset(SNAPSHOT_INDEX_KEY, snapshot_key, {
+		"configuration": config.name,
+		"version": config.version,
+		"generation": generation,
+		"built_at": time.time()
+	})
+	publish_progress(snapshot_key, configuration_name, len(records), total, done=True)
+
+
+def get_fresh_snapshot(config, start_date, end_date, filters, format):
+	"""Get the materialised `get_timeline_data` response of a window brought up to date, or None
+
+	Snapshots older than `chronos_snapshot_max_age` seconds (site config) are not
+	served. Once rows or blocks of the configuration changed, the changes since
+	the snapshot's watermark are merged in and a rebuild is queued. Columnar
+	snapshots cannot be merged and are only served while their generation is
+	current. The result goes through the result cache, so the file is read once
+	per generation rather than once per request.
+	"""
+	snapshot_key = get_snapshot_key(config, start_date, end_date, filters, format)
+	snapshot = frappe.cache().hget(SNAPSHOT_INDEX_KEY, snapshot_key)
+	if not snapshot or snapshot["version"] != config.version:
+		return None
+
+	max_age = cint(frappe.conf.get("chronos_snapshot_max_age") or DEFAULT_MAX_AGE)
+	if time.time() - snapshot["built_at"] > max_age:
+		return None
+
+	if format == "columnar" and snapshot["generation"] != get_generation(config.name):
+		return None
+
+	if not os.path.exists(get_snapshot_path(snapshot_key)):
+		return None
+
+	def build_snapshot_result():
+		result = read_snapshot(snapshot_key)
+		# Checked here, after the cache key took the generation, so a change in between is merged too
+		if format != "columnar" and snapshot["generation"] != get_generation(config.name):
+			# Imported here, timeline_data serves snapshots from this module
+			from chronos.api.timeline_data import get_timeline_result
+
+			delta = get_timeline_result(config, start_date, end_date, filters, since=result["watermark"], format=format)
+			result = merge_delta(result, delta)
+			enqueue_snapshot(config.name, start_date, end_date, filters, format, snapshot_key)
+
+		result["snapshot"] = {"key": snapshot_key, "built_at": snapshot["built_at"]}
+		return result
+
+	return get_cached_result(
+		"snapshot",
+		config,
+		{"snapshot_key": snapshot_key, "built_at": snapshot["built_at"]},
+		build_snapshot_result
+	)
+
+
+def read_snapshot(snapshot_key):
+	with gzip.open(get_snapshot_path(snapshot_key), "rt") as f:
+		return json.load(f)
+
+
+def merge_delta(result, delta):
+	"""Merge a `since` delta response into a full one: entries replaced by id, removed ones dropped"""
+	for key, removed_key in (("rows", "removed_rows"), ("blocks", "removed_blocks")):
+		changed = {entity["id"]: entity for entity in delta[key]}
+		removed = set(delta[removed_key])
+
+		merged = []
+		for entity in result[key]:
+			if entity["id"] in removed:
+				continue
+			merged.append(changed.pop(entity["id"], entity))
+		result[key] = merged + list(changed.values())
+
+	result["watermark"] = delta["watermark"]
+	return result
+
+
+def get_snapshot_key(config, start_date, end_date, filters, format):
+	"""Identify a snapshot by configuration, window, filters, format and the user's permission scope"""
+	params = [config.name, str(start_date), str(end_date), filters or {}, format, get_permission_scope()]
+	return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_snapshot_path(snapshot_key):
+	return frappe.get_site_path("private", "files", SNAPSHOT_FOLDER, f"{snapshot_key}.json.gz")
+
+
+def publish_progress(snapshot_key, configuration_name, processed, total, done=False):
+	frappe.publish_realtime(
+		"chronos_snapshot_progress",
+		{
+			"snapshot_key": snapshot_key,
+			"configuration": configuration_name,
+			"processed": processed,
+			"total": total,
+			"done": done
+		},
+		user=frappe.session.user
+	)
+
+
+def clear_expired_snapshots():
+	"""Scheduler job: delete snapshot files past their retention and forget them"""
+	cache = frappe.cache()
+	cutoff = time.time() - RETENTION_DAYS * 86400
+
+	for snapshot_key, snapshot in (cache.hgetall(SNAPSHOT_INDEX_KEY) or {}).items():
+		if snapshot["built_at"] >= cutoff:
+			continue
+
+		snapshot_key = frappe.safe_decode(snapshot_key)
+		path = get_snapshot_path(snapshot_key)
+		if os.path.exists(path):
+			os.remove(path)
+		cache.hdel(SNAPSHOT_INDEX_KEY, snapshot_key)
@@ -0,0 +1,313 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+import json
+import random
+import time
+import tracemalloc
+
+import frappe
+from frappe.utils import add_days, nowdate
+
+import chronos
+from chronos.api.change_log import flush_change_log
+from chronos.api.profiling import track_queries
+from chronos.api.timeline_cache import invalidate_configuration
+from chronos.api.timeline_data import (
+	create_dynamic_block,
+	get_block_entities,
+	get_timeline_data,
+	update_block_assignment
+)
+from chronos.api.timeline_journal import REDO_KEY, UNDO_KEY
+from chronos.api.timeline_plan import get_timeline_plan
+
+ROW_DOCTYPE = "Chronos Benchmark Row"
+BLOCK_DOCTYPE = "Chronos Benchmark Block"
+CONFIGURATION_NAME = "Chronos Benchmark"
+
+# Blocks are spread over this many days from today; reads query the first 30
+SPREAD_DAYS = 90
+WINDOW_DAYS = 30
+
+
+def run_benchmark(block_count=10000, row_count=100, iterations=20, keep_data=False, seed=42):
+	"""Generate synthetic rows and blocks, time the timeline endpoints on them and return the report"""
+	frappe.set_user("Administrator")
+	rng = random.Random(seed)
+
+	setup_doctypes()
+	setup_configuration()
+
+	started = time.perf_counter()
+	row_names = generate_data(rng, row_count, block_count)
+	generated_in = time.perf_counter() - started
+
+	try:
+		results = run_endpoints(rng, row_names, iterations)
+	finally:
+		if not keep_data:
+			clear_data()
+
+	return {
+		"site": frappe.local.site,
+		"frappe_version": frappe.__version__,
+		"chronos_version": chronos.__version__,
+		"timestamp": frappe.utils.now(),
+		"scale": {"blocks": block_count, "rows": row_count, "iterations": iterations, "window_days": WINDOW_DAYS},
+		"generated_in_sec": round(generated_in, 3),
+		"results": results
+	}
+
+
+def run_endpoints(rng, row_names, iterations):
+	"""Time every benchmarked endpoint, reads first"""
+	start_date = nowdate()
+	end_date = add_days(start_date, WINDOW_DAYS)
+	config = get_timeline_plan(CONFIGURATION_NAME)
+	block_names = frappe.get_all(BLOCK_DOCTYPE, pluck="name", limit_page_length=iterations * 10)
+
+	def cold_cache(i):
+		invalidate_configuration(CONFIGURATION_NAME)
+
+	def read_timeline(format=None):
+		def call(i):
+			response = get_timeline_data(CONFIGURATION_NAME, start_date, end_date, format=format)
+			blocks = response["blocks"]
+			return response["success"], blocks["count"] if isinstance(blocks, dict) else len(blocks)
+		return call
+
+	def read_block_entities(i):
+		blocks = get_block_entities(config, start_date, end_date)
+		return True, len(blocks)
+
+	def move_block(i):
+		new_start = datetime.datetime.combine(
+			frappe.utils.getdate(add_days(start_date, rng.randrange(WINDOW_DAYS))),
+			datetime.time(rng.randrange(6, 18))
+		)
+		response = update_block_assignment(
+			BLOCK_DOCTYPE,
+			rng.choice(block_names),
+			rng.choice(row_names),
+			new_datetime=new_start.isoformat(),
+			config_name=CONFIGURATION_NAME
+		)
+		return response["success"], 1
+
+	def create_block(i):
+		response = create_dynamic_block(make_block(rng, row_names, start_date), CONFIGURATION_NAME)
+		return response["success"], 1
+
+	return {
+		"get_timeline_data": measure(read_timeline(), iterations, before=cold_cache),
+		"get_timeline_data_cached": measure(read_timeline(), iterations),
+		"get_timeline_data_columnar": measure(read_timeline("columnar"), iterations, before=cold_cache),
+		"get_block_entities": measure(read_block_entities, iterations),
+		"update_block_assignment": measure(move_block, iterations),
+		"create_dynamic_block": measure(create_block, iterations)
+	}
+
+
+def measure(call, iterations, before=None):
+	"""Call `call(i)` `iterations` times and summarise latency, queries, throughput and memory
+
+	`call` returns `(success, records)`; `before(i)` runs untimed before each call.
+	Peak memory comes from one extra traced call, so tracing does not skew latencies.
+	"""
+	latencies = []
+	query_counts = []
+	records = 0
+	failures = 0
+
+	for i in range(iterations):
+		if before:
+			before(i)
+
+		with track_queries() as queries:
+			started = time.perf_counter()
+			success, count = call(i)
+			latencies.append(time.perf_counter() - started)
+
+		query_counts.append(queries["count"])
+		records += count
+		failures += not success
+
+	if before:
+		before(iterations)
+	tracemalloc.start()
+	try:
+		call(iterations)
+		peak_memory = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+	latencies.sort()
+	total = sum(latencies)
+	return {
+		"iterations": iterations,
+		"failures": failures,
+		"p50_ms": round(percentile(latencies, 50) * 1000, 2),
+		"p95_ms": round(percentile(latencies, 95) * 1000, 2),
+		"p99_ms": round(percentile(latencies, 99) * 1000, 2),
+		"mean_ms": round(total / iterations * 1000, 2),
+		"max_ms": round(latencies[-1] * 1000, 2),
+		"queries_per_call": round(sum(query_counts) / iterations, 1),
+		"rows_per_sec": round(records / total) if total else None,
+		"peak_memory_mb": round(peak_memory / 1024 / 1024, 2)
+	}
+
+
+def percentile(sorted_values, percent):
+	index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+	return sorted_values[index]
+
+
+def setup_doctypes():
+	"""Create the synthetic row and block doctypes once"""
+	permissions = [{"role": "System Manager", "read": 1, "write": 1, "create": 1, "delete": 1}]
+
+	if not frappe.db.exists("DocType", ROW_DOCTYPE):
+		frappe.get_doc({
+			"doctype": "DocType",
+			"name": ROW_DOCTYPE,
+			"module": "Chronos",
+			"custom": 1,
+			"autoname": "hash",
+			"fields": [
+				{"fieldname": "row_label", "fieldtype": "Data", "label": "Label"},
+				{"fieldname": "status", "fieldtype": "Select", "label": "Status", "options": "Active\nDisabled"}
+			],
+			"permissions": permissions
+		}).insert(ignore_permissions=True)
+
+	if not frappe.db.exists("DocType", BLOCK_DOCTYPE):
+		frappe.get_doc({
+			"doctype": "DocType",
+			"name": BLOCK_DOCTYPE,
+			"module": "Chronos",
+			"custom": 1,
+			"autoname": "hash",
+			"fields": [
+				{"fieldname": "title", "fieldtype": "Data", "label": "Title"},
+				{"fieldname": "bench_row", "fieldtype": "Link", "label": "Row", "options": ROW_DOCTYPE, "search_index": 1},
+				{"fieldname": "start_time", "fieldtype": "Datetime", "label": "Start", "search_index": 1},
+				{"fieldname": "end_time", "fieldtype": "Datetime", "label": "End"},
+				{"fieldname": "hours", "fieldtype": "Float", "label": "Hours"},
+				{"fieldname": "status", "fieldtype": "Select", "label": "Status", "options": "Open\nIn Progress\nCompleted"},
+				{"fieldname": "priority", "fieldtype": "Select", "label": "Priority", "options": "Low\nMedium\nHigh\nUrgent"}
+			],
+			"permissions": permissions
+		}).insert(ignore_permissions=True)
+
+	frappe.db.commit()
+
+
+def setup_configuration():
+	"""Create the Timeline Configuration mapping the synthetic doctypes once"""
+	if frappe.db.exists("Timeline Configuration", CONFIGURATION_NAME):
+		return
+
+	frappe.get_doc({
+		"doctype": "Timeline Configuration",
+		"configuration_name": CONFIGURATION_NAME,
+		"description": "Synthetic data for chronos-benchmark",
+		"is_active": 1,
+		"row_doctype": ROW_DOCTYPE,
+		"block_doctype": BLOCK_DOCTYPE,
+		"row_to_block_field": "bench_row",
+		"block_to_date_field": "start_time",
+		"row_label_field": "row_label",
+		"block_label_field": "title",
+		"block_color_field": "status",
+		"date_range_end_field": "end_time",
+		"block_duration_field": "hours",
+		"block_status_field": "status",
+		"block_priority_field": "priority"
+	}).insert(ignore_permissions=True)
+	frappe.db.commit()
+
+
+def generate_data(rng, row_count, block_count):
+	"""Replace the synthetic rows and blocks with fresh ones; returns the row names"""
+	clear_data()
+
+	now = frappe.utils.now()
+	user = frappe.session.user
+	row_names = [f"BR-{index:05d}" for index in range(row_count)]
+	frappe.db.bulk_insert(
+		ROW_DOCTYPE,
+		["name", "creation", "modified", "owner", "modified_by", "row_label", "status"],
+		[[name, now, now, user, user, f"Row {name}", "Active"] for name in row_names]
+	)
+
+	start_date = nowdate()
+	values = []
+	for index in range(block_count):
+		block = make_block(rng, row_names, start_date, SPREAD_DAYS)
+		values.append([
+			f"BB-{index:07d}", now, now, user, user,
+			block["title"], block["bench_row"], block["start_time"], block["end_time"],
+			block["hours"], block["status"], block["priority"]
+		])
+
+	frappe.db.bulk_insert(
+		BLOCK_DOCTYPE,
+		["name", "creation", "modified", "owner", "modified_by", "title", "bench_row", "start_time", "end_time",
+			"hours", "status", "priority"],
+		values
+	)
+	frappe.db.commit()
+	invalidate_configuration(CONFIGURATION_NAME)
+
+	return row_names
+
+
+def make_block(rng, row_names, start_date, spread_days=WINDOW_DAYS):
+	"""Build the values of one random block"""
+	hours = rng.choice([1, 2, 4, 8])
+	start = datetime.datetime.combine(
+		frappe.utils.getdate(add_days(start_date, rng.randrange(spread_days))),
+		datetime.time(rng.randrange(6, 18))
+	)
+
+	return {
+		"doctype": BLOCK_DOCTYPE,
+		"title": f"Job {rng.randrange(1000000)}",
+		"bench_row": rng.choice(row_names),
+		"start_time": start,
+		"end_time": start + datetime.timedelta(hours=hours),
+		"hours": hours,
+		"status": rng.choice(["Open", "In Progress", "Completed"]),
+		"priority": rng.choice(["Low", "Medium", "High", "Urgent"])
+	}
+
+
+def clear_data():
+	"""Delete every synthetic row and block, and the change log and journal entries of the writes"""
+	frappe.db.delete(BLOCK_DOCTYPE)
+	frappe.db.delete(ROW_DOCTYPE)
+	frappe.db.commit()
+
+	flush_change_log()
+	frappe.db.delete("Timeline Change Log", {"block_doctype": BLOCK_DOCTYPE})
+	frappe.db.commit()
+	clear_journal()
+
+
+def clear_journal():
+	"""Drop the benchmark's operations from the user's undo/redo journal, keeping the others"""
+	cache = frappe.cache()
+	for key in (UNDO_KEY, REDO_KEY):
+		name = key.format(frappe.session.user)
+		entries = cache.lrange(name, 0, -1) or []
+		kept = [entry for entry in entries if not any(op[1] == BLOCK_DOCTYPE for op in json.loads(entry)["ops"])]
+		if len(kept) == len(entries):
+			continue
+
+		pipeline = cache.pipeline()
+		pipeline.delete(cache.make_key(name))
+		if kept:
+			pipeline.rpush(cache.make_key(name), *kept)
+		pipeline.execute()
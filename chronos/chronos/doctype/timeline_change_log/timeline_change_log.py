@@ -0,0 +1,8 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+class TimelineChangeLog(Document):
+	"""Append-only history of timeline block changes, written in bulk by `chronos.api.change_log.flush_change_log`"""
+	pass
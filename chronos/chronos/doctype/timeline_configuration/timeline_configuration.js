@@ -0,0 +1,34 @@
+// Copyright (c) 2025, ONFUSE AG and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Timeline Configuration", {
+	refresh(frm) {
+		if (frm.is_new()) return;
+
+		frm.add_custom_button(__("Check Indexes"), () => {
+			frm.call("get_index_report").then(({ message }) => {
+				const rows = message.indexes.map(
+					(index) => `(${index.fields.join(", ")}): ${index.exists ? __("present") : __("missing")}`
+				);
+				const scans = message.explain.map(
+					(row) => `${row.table}: ${row.type}${row.key ? ` ${__("using")} ${row.key}` : ""}, ~${row.rows} ${__("rows")}`
+				);
+				frappe.msgprint({
+					title: __("Block Table Indexes"),
+					message: rows.concat(scans).join("<br>"),
+				});
+			});
+		}, __("Indexes"));
+
+		frm.add_custom_button(__("Create Recommended Indexes"), () => {
+			frm.call("create_recommended_indexes").then(({ message }) => {
+				frappe.show_alert({
+					message: message.length
+						? __("Created {0}", [message.join(", ")])
+						: __("All recommended indexes already exist"),
+					indicator: "green",
+				});
+			});
+		}, __("Indexes"));
+	},
+});
@@ -4,11 +4,25 @@
 import frappe
 from frappe.model.document import Document
 
+from chronos.api.timeline_plan import clear_timeline_plan_on_commit
+
 class TimelineConfiguration(Document):
 	def validate(self):
 		"""Validate the timeline configuration"""
 		self.validate_doctypes()
 		self.validate_field_mappings()
+
+	def on_update(self):
+		"""Drop the compiled plan so the next request recompiles it"""
+		clear_timeline_plan_on_commit(self.name)
+		self.report_missing_indexes()
+
+	def on_trash(self):
+		clear_timeline_plan_on_commit(self.name)
+
+	def after_rename(self, old_name, new_name, merge=False):
+		clear_timeline_plan_on_commit(old_name)
+		clear_timeline_plan_on_commit(new_name)
 	
 	def validate_doctypes(self):
 		"""Validate that the specified DocTypes exist"""
@@ -52,6 +66,111 @@ class TimelineConfiguration(Document):
 			if field and not block_meta.get_field(field):
 				frappe.throw(f"Optional field '{field}' does not exist in DocType '{self.block_doctype}'")
 	
+	def get_recommended_indexes(self):
+		"""Get the composite indexes the timeline window query needs on the block table"""
+		window_fields = [self.block_to_date_field]
+		if self.date_range_end_field:
+			window_fields.append(self.date_range_end_field)
+
+		return [
+			[self.row_to_block_field] + window_fields,
+			window_fields
+		]
+
+	def get_existing_indexes(self):
+		"""Get the column lists of the indexes on the block table"""
+		table = f"tab{self.block_doctype}"
+		indexes = {}
+
+		if frappe.db.db_type == "postgres":
+			for index in frappe.db.sql(
+				"""select indexname, indexdef from pg_indexes where tablename = %s""", table, as_dict=True
+			):
+				columns = index.indexdef.split("(", 1)[-1].rstrip(")")
+				indexes[index.indexname] = [column.strip().strip('"') for column in columns.split(",")]
+		else:
+			for index in frappe.db.sql(f"SHOW INDEX FROM `{table}`", as_dict=True):
+				indexes.setdefault(index.Key_name, []).append((index.Seq_in_index, index.Column_name))
+			indexes = {name: [column for seq, column in sorted(columns)] for name, columns in indexes.items()}
+
+		return list(indexes.values())
+
+	@frappe.whitelist()
+	def get_index_report(self):
+		"""Check the recommended indexes and EXPLAIN the window query"""
+		existing = self.get_existing_indexes()
+		recommendations = []
+		for fields in self.get_recommended_indexes():
+			recommendations.append({
+				"fields": fields,
+				"index_name": get_index_name(fields),
+				"exists": any(index[:len(fields)] == fields for index in existing)
+			})
+
+		return {
+			"indexes": recommendations,
+			"explain": self.explain_window_query()
+		}
+
+	def explain_window_query(self):
+		"""EXPLAIN the block query of a 30-day window (MariaDB only)"""
+		if frappe.db.db_type == "postgres":
+			return []
+
+		from chronos.api.timeline_plan import get_timeline_plan
+
+		config = get_timeline_plan(self.name)
+		start_date = frappe.utils.nowdate()
+		query = frappe.get_all(
+			config.block_doctype,
+			filters=config.get_date_filters(start_date, frappe.utils.add_days(start_date, 30)),
+			fields=config.block_fields,
+			order_by=config.block_order_by,
+			run=0
+		)
+
+		return [
+			{"table": row.get("table"), "type": row.get("type"), "key": row.get("key"), "rows": row.get("rows")}
+			for row in frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+		]
+
+	def report_missing_indexes(self):
+		"""Tell the user when the block table lacks the indexes the timeline relies on"""
+		if frappe.flags.in_install or frappe.flags.in_migrate or frappe.flags.in_import:
+			return
+
+		try:
+			report = self.get_index_report()
+		except Exception:
+			frappe.log_error(frappe.get_traceback(), "Timeline Index Report Error")
+			return
+
+		missing = [index for index in report["indexes"] if not index["exists"]]
+		if not missing:
+			return
+
+		full_scan = any(row["type"] == "ALL" for row in report["explain"])
+		message = "<br>".join(f"({', '.join(index['fields'])})" for index in missing)
+		frappe.msgprint(
+			f"The timeline query on {self.block_doctype} {'does a full table scan' if full_scan else 'may scan many rows'}. "
+			f"Missing indexes:<br>{message}<br>Use <b>Create Recommended Indexes</b> to add them.",
+			title="Missing Indexes",
+			indicator="orange"
+		)
+
+	@frappe.whitelist()
+	def create_recommended_indexes(self):
+		"""Create the missing composite indexes on the block table"""
+		frappe.only_for("System Manager")
+
+		created = []
+		for index in self.get_index_report()["indexes"]:
+			if not index["exists"]:
+				frappe.db.add_index(self.block_doctype, index["fields"], index["index_name"])
+				created.append(index["index_name"])
+
+		return created
+
 	def get_configuration_metadata(self):
 		"""Get metadata about the configuration including field types"""
 		row_meta = frappe.get_meta(self.row_doctype)
@@ -86,6 +205,10 @@ class TimelineConfiguration(Document):
 			}
 		}
 
+def get_index_name(fields):
+	"""Name of the index Chronos creates for `fields`, within MariaDB's 64 character limit"""
+	return f"chronos_{'_'.join(fields)}"[:64]
+
 @frappe.whitelist()
 def get_available_configurations():
 	"""Get all active timeline configurations"""
@@ -0,0 +1,40 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import json
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("chronos-benchmark")
+@click.option("--blocks", default=10000, help="Number of synthetic blocks (e.g. 1000, 10000, 100000)")
+@click.option("--rows", default=100, help="Number of synthetic rows (e.g. 100, 1000)")
+@click.option("--iterations", default=20, help="Calls per endpoint")
+@click.option("--output", help="Write the JSON report to this file instead of stdout")
+@click.option("--keep-data", is_flag=True, default=False, help="Keep the synthetic rows and blocks afterwards")
+@pass_context
+def chronos_benchmark(context, blocks, rows, iterations, output=None, keep_data=False):
+	"""Benchmark the timeline read and write endpoints against synthetic data"""
+	import frappe
+
+	from chronos.benchmark import run_benchmark
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+
+	try:
+		report = run_benchmark(block_count=blocks, row_count=rows, iterations=iterations, keep_data=keep_data)
+	finally:
+		frappe.destroy()
+
+	report = json.dumps(report, indent=1)
+	if output:
+		with open(output, "w") as f:
+			f.write(report)
+	else:
+		click.echo(report)
+
+
+commands = [chronos_benchmark]
@@ -125,17 +125,45 @@ app_license = "mit"
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"*": {
+		# on_change also runs on submit, cancel, update after submit and db_set
+		"on_change": [
+			"chronos.realtime.on_block_change",
+			"chronos.api.timeline_cache.on_document_change"
+		],
+		"on_trash": [
+			"chronos.realtime.on_block_change",
+			"chronos.api.timeline_cache.on_document_change"
+		]
+	},
+	"DocType": {
+		"on_update": "chronos.api.timeline_plan.clear_timeline_plans"
+	},
+	"Custom Field": {
+		"on_update": "chronos.api.timeline_plan.clear_timeline_plans",
+		"on_trash": "chronos.api.timeline_plan.clear_timeline_plans"
+	},
+	"Property Setter": {
+		"on_update": "chronos.api.timeline_plan.clear_timeline_plans",
+		"on_trash": "chronos.api.timeline_plan.clear_timeline_plans"
+	}
+}
 
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"cron": {
+		"* * * * *": [
+			"chronos.api.change_log.flush_change_log"
+		]
+	},
+	"daily": [
+		"chronos.api.timeline_snapshot.clear_expired_snapshots"
+	]
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"chronos.tasks.all"
@@ -185,7 +213,7 @@ app_license = "mit"
 # Request Events
 # ----------------
 # before_request = ["chronos.utils.before_request"]
-# after_request = ["chronos.utils.after_request"]
+after_request = ["chronos.api.profiling.add_profile_header"]
 
 # Job Events
 # ----------
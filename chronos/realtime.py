@@ -17,12 +17,13 @@ def emit_task_update(task):
         frappe.logger().error(f"Error emitting task update: {str(e)}")
 
 def emit_batch_update(tasks):
-    """Emit real-time update for batch task changes"""
+    """Emit real-time update for batch task changes (any doctype, e.g. timeline blocks)"""
     try:
         updates = [{
             'task_id': task.name,
-            'status': task.status,
-            'assignee': task._assign,
+            'doctype': task.doctype,
+            'status': task.get('status'),
+            'assignee': task.get('_assign'),
             'modified': str(task.modified)
         } for task in tasks]
         
@@ -33,3 +34,63 @@ def emit_batch_update(tasks):
         )
     except Exception as e:
         frappe.logger().error(f"Error emitting batch update: {str(e)}")
+
+def on_block_change(doc, method=None):
+    """doc_events hook (on_change, on_trash): queue a timeline diff when a block of an active configuration changes"""
+    if frappe.flags.in_install or frappe.flags.in_migrate or frappe.flags.in_patch:
+        return
+
+    from chronos.api.timeline_plan import get_block_doctype_configurations, get_timeline_plan
+
+    try:
+        configurations = get_block_doctype_configurations().get(doc.doctype)
+        if not configurations:
+            return
+
+        for configuration_name in configurations:
+            queue_timeline_update(get_timeline_plan(configuration_name), doc, removed=method == "on_trash")
+    except Exception as e:
+        frappe.logger().error(f"Error queueing timeline update: {str(e)}")
+
+def queue_timeline_update(config, block_doc, removed=False):
+    """Add a block to this transaction's diff for `config`; diffs are published once, after commit"""
+    from chronos.api.timeline_plan import get_block_values
+
+    pending = frappe.local.flags.setdefault('chronos_timeline_updates', {})
+    if not pending:
+        frappe.db.after_commit.add(publish_timeline_updates)
+        frappe.db.after_rollback.add(discard_timeline_updates)
+
+    diff = pending.setdefault(config.name, {
+        'doctype': config.block_doctype,
+        'blocks': {},
+        'removed': set()
+    })
+
+    if removed:
+        diff['blocks'].pop(block_doc.name, None)
+        diff['removed'].add(block_doc.name)
+    else:
+        diff['removed'].discard(block_doc.name)
+        diff['blocks'][block_doc.name] = config.format_block(get_block_values(config, block_doc))
+
+def publish_timeline_updates():
+    """Publish the coalesced diffs to everyone subscribed to the block doctype"""
+    pending = frappe.local.flags.pop('chronos_timeline_updates', None) or {}
+    for configuration_name, diff in pending.items():
+        try:
+            frappe.publish_realtime(
+                f'chronos_timeline:{configuration_name}',
+                {
+                    'configuration': configuration_name,
+                    'blocks': list(diff['blocks'].values()),
+                    'removed': list(diff['removed'])
+                },
+                doctype=diff['doctype']
+            )
+        except Exception as e:
+            frappe.logger().error(f"Error emitting timeline update: {str(e)}")
+
+def discard_timeline_updates():
+    """Drop the diffs of a transaction that was rolled back"""
+    frappe.local.flags.pop('chronos_timeline_updates', None)
@@ -0,0 +1,34 @@
+# Copyright (c) 2025, ONFUSE AG and contributors
+# For license information, please see license.txt
+
+import datetime
+
+import frappe
+
+# Block records in tests are `block(...)` tuples in this field order
+BLOCK_FIELDS = ["name", "row", "start", "end", "hours", "priority"]
+
+
+def make_config(fieldtype="Datetime", duration=True):
+	"""Build the subset of a TimelinePlan the interval and scheduling helpers read"""
+	return frappe._dict({
+		"block_fields": BLOCK_FIELDS,
+		"row_to_block_field": "row",
+		"block_to_date_field": "start",
+		"date_range_end_field": "end",
+		"block_duration_field": "hours" if duration else None,
+		"block_priority_field": "priority",
+		"field_types": {"start": fieldtype, "end": fieldtype}
+	})
+
+
+def block(name, row, start, end, hours=0, priority=None):
+	return (name, row, start, end, hours, priority)
+
+
+def at(day, hour=0, minute=0):
+	return datetime.datetime(2025, 1, day, hour, minute)
+
+
+def on(day):
+	return datetime.date(2025, 1, day)
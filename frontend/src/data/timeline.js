@@ -0,0 +1,120 @@
+import { call } from 'frappe-ui'
+
+/**
+ * Merge a delta response of `get_timeline_data` (called with `since`) into the
+ * current board. Entries are replaced by id, removed ones are dropped and new
+ * ones appended, so untouched objects keep their identity for Vue.
+ * @param {Array} current - Current rows or blocks
+ * @param {Array} changed - Changed rows or blocks from the delta response
+ * @param {Array} removed - Names that left the board
+ * @returns {Array} Merged list
+ */
+export function mergeTimelineEntities(current, changed = [], removed = []) {
+  const changedById = new Map(changed.map((entity) => [entity.id, entity]))
+  const removedIds = new Set(removed)
+
+  const merged = []
+  for (const entity of current) {
+    if (removedIds.has(entity.id)) continue
+    if (changedById.has(entity.id)) {
+      merged.push(changedById.get(entity.id))
+      changedById.delete(entity.id)
+    } else {
+      merged.push(entity)
+    }
+  }
+
+  return merged.concat(Array.from(changedById.values()))
+}
+
+/**
+ * Convert epoch seconds of a naive server datetime back to `YYYY-MM-DD HH:mm:ss`
+ * @param {number|null} seconds - Epoch seconds, or null
+ * @returns {string|null} Datetime string as sent by the object payload
+ */
+const fromEpoch = (seconds) => {
+  if (seconds === null || seconds === undefined) return null
+  return new Date(seconds * 1000).toISOString().slice(0, 19).replace('T', ' ')
+}
+
+/**
+ * Expand the blocks of a `get_timeline_data` response into block objects.
+ * Accepts both the default object list and the `format: "columnar"` payload
+ * (schema + parallel arrays), so callers can switch formats transparently.
+ * @param {Array|Object} payload - `blocks` of the response
+ * @returns {Array} Block objects
+ */
+export function decodeTimelineBlocks(payload) {
+  if (!payload) return []
+  if (Array.isArray(payload)) return payload
+
+  const { schema, columns, count, doctype } = payload
+  const rowIds = payload.row_ids || []
+  const epochColumns = new Set(payload.epoch_columns || [])
+  const values = schema.map((key, index) =>
+    epochColumns.has(key) ? columns[index].map(fromEpoch) : columns[index],
+  )
+  const hasDuration = schema.includes('duration')
+
+  const blocks = new Array(count)
+  for (let i = 0; i < count; i++) {
+    const block = { doctype }
+    for (let c = 0; c < schema.length; c++) {
+      block[schema[c]] = values[c][i]
+    }
+
+    const rowIndex = block.row_index
+    delete block.row_index
+
+    block.name = block.id
+    block.label = block.label || block.id
+    block.row_id = rowIndex === null ? null : rowIds[rowIndex]
+
+    if (payload.date_range) {
+      if (block.date) block.start_date = block.date
+      if (!block.end_date) delete block.end_date
+    }
+    if (hasDuration) block.duration = block.duration || 0
+
+    blocks[i] = block
+  }
+
+  return blocks
+}
+
+/**
+ * Check whether a block overlaps the visible date range
+ * @param {Object} block - Block object
+ * @param {string} startDate - First visible day (YYYY-MM-DD)
+ * @param {string} endDate - Last visible day (YYYY-MM-DD)
+ * @returns {boolean} True if the block should be on the board
+ */
+export function isBlockInRange(block, startDate, endDate) {
+  const start = (block.start_date || block.date || '').slice(0, 10)
+  const end = (block.end_date || start).slice(0, 10)
+  if (!start) return false
+  return start <= endDate && end >= startDate
+}
+
+const fieldMetadataCache = new Map()
+
+/**
+ * Get the field metadata of a configuration, revalidating the cached copy with
+ * its ETag so unchanged metadata is not sent again
+ * @param {string} configurationName - Timeline Configuration name
+ * @returns {Promise<Object>} Field metadata keyed by fieldname
+ */
+export async function fetchFieldMetadata(configurationName) {
+  const cached = fieldMetadataCache.get(configurationName)
+  const response = await call('chronos.api.timeline_data.get_configuration_field_metadata', {
+    configuration_name: configurationName,
+    etag: cached?.etag,
+  })
+
+  if (!response.success) throw new Error(response.error || 'Failed to load field metadata')
+  if (response.not_modified && cached) return cached.fieldMetadata
+
+  const fieldMetadata = response.field_metadata || {}
+  fieldMetadataCache.set(configurationName, { etag: response.etag, fieldMetadata })
+  return fieldMetadata
+}
@@ -0,0 +1,26 @@
+import { io } from 'socket.io-client'
+
+let socket = null
+
+/**
+ * Get the shared Frappe socket.io connection, opening it on first use
+ * @returns {Socket} socket.io client
+ */
+export function getSocket() {
+  if (socket) return socket
+
+  const { protocol, hostname, port } = window.location
+  const siteName = templateValue(window.site_name) || hostname
+  // In development the page is served by vite and socket.io runs on its own port
+  const socketPort = port ? `:${templateValue(window.socketio_port) || 9000}` : ''
+
+  socket = io(`${protocol}//${hostname}${socketPort}/${siteName}`, {
+    withCredentials: true,
+    reconnectionAttempts: 5,
+  })
+
+  return socket
+}
+
+// Values injected by www/frontend.html are left unrendered when served by vite
+const templateValue = (value) => (value && !String(value).startsWith('{{') ? value : null)